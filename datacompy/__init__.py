@@ -17,4 +17,5 @@
 from __future__ import absolute_import
 from datacompy.core import *
 from datacompy._version import __version__
+from datacompy.streamcompare import StreamCompare
 from datacompy.sparkcompare import SparkCompare, NUMERIC_SPARK_TYPES
@@ -24,18 +24,49 @@ two dataframes.
 
 import os
 import logging
+import threading
+from collections import OrderedDict
+from multiprocessing import Pool, cpu_count
+from multiprocessing.pool import ThreadPool
 import pandas as pd
 import numpy as np
 
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None  # Python < 3.8: column buffers are pickled to the workers instead
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:
+    try:
+        from pandas.core.tools.datetimes import guess_datetime_format
+    except ImportError:
+        guess_datetime_format = None
+
+try:
+    import pyarrow
+    import pyarrow.compute
+except ImportError:
+    pyarrow = None  # Only needed for Arrow-backed columns, and to compare decimals exactly
+
 LOG = logging.getLogger(__name__)
 
+# Number of rows compare_numeric_columns works through at a time
+NUMERIC_CHUNK_SIZE = 2 ** 16
+
+# Number of leading values of a column decimal_arrays infers the scale from
+DECIMAL_SAMPLE_SIZE = 1000
+
 
 class Compare(object):
     """Comparison class to be used to compare whether two dataframes as equal.
 
     Both df1 and df2 should be dataframes containing all of the join_columns,
     with unique column names. Differences between values are compared to
-    abs_tol + rel_tol * abs(df2['value']).
+    abs_tol + rel_tol * abs(df2['value']).  The result dataframes
+    (``df1_unq_rows``, ``df2_unq_rows`` and ``intersect_rows``) are only built,
+    from row indexers into df1 and df2, when they are first accessed.
 
     Parameters
     ----------
@@ -62,6 +93,50 @@ class Compare(object):
         A string name for the second dataframe
     ignore_spaces : bool, optional
         Flag to strip whitespace (including newlines) from string columns
+    n_jobs : int, optional
+        The number of threads to compare columns with, following the joblib
+        convention: None or 1 (the default) compares them one at a time, -1
+        uses one thread per CPU, and below -1, (CPUs + 1 + n_jobs) threads
+        are used, so -2 uses all CPUs but one.  0 raises a ``ValueError``.
+    inplace : bool, optional
+        If True (the default), the column names of df1 and df2 are lowercased
+        in place.  If False, df1 and df2 are never modified: if needed, the
+        names are lowercased on a shallow copy which shares their data, and
+        ``Compare.df1`` / ``Compare.df2`` refer to that copy.  This makes it
+        safe to compare the same dataframe from several threads at once.
+    n_partitions : int, optional
+        If more than 1, both dataframes are hash-partitioned on the join keys
+        into this many partitions, and each partition is joined and compared
+        in its own worker process.  The numeric column buffers are passed to
+        the workers through shared memory (Python 3.8+), other columns are
+        pickled, as are the comparators added with ``register_comparator``.
+        The results are merged back into this ``Compare``, so they are the
+        same as with the default of 1.
+    ignore_case : bool, optional
+        Flag to ignore the case of string columns
+    datetime_tol : pandas.Timedelta, optional
+        Tolerance between two datetime (or timedelta) values, or anything
+        ``pandas.Timedelta`` accepts, e.g. ``"1s"``.  By default they have to
+        be equal.
+    stats_only : bool, optional
+        If True, only the statistics (``column_stats``, row and column counts)
+        and a random sample of up to ``sample_count`` mismatching rows per
+        column and unique rows per dataframe are kept once the comparison is
+        done.  The dataframes and the row results are released, so
+        ``df1_unq_rows``, ``df2_unq_rows`` and ``intersect_rows`` aren't
+        available, and the memory the ``Compare`` holds on to no longer
+        depends on the size of the data.
+    sample_count : int, optional
+        The number of sample rows to keep with ``stats_only``
+    lazy : bool, optional
+        If True, constructing the ``Compare`` only validates df1 and df2, and
+        each result is computed by the first query that needs it: the column
+        overlap (``all_columns_match``, ``intersect_columns``...) needs no
+        pass over the data, the row overlap (``all_rows_overlap``,
+        ``df1_unq_rows``, ``df2_unq_rows``) only joins the keys, and anything
+        that depends on the values (``column_stats``, ``matches``,
+        ``intersect_rows``, ``report``...) runs the full comparison.  With
+        ``stats_only``, the data is released once the full comparison has run.
 
     Attributes
     ----------
@@ -69,6 +144,13 @@ class Compare(object):
         All records that are only in df1 (based on a join on join_columns)
     df2_unq_rows : pandas ``DataFrame``
         All records that are only in df2 (based on a join on join_columns)
+    intersect_rows : pandas ``DataFrame``
+        All records that are in both df1 and df2, with the df1 and df2
+        versions of shared columns and a ``_match`` column for each of them
+    df1_fingerprints : dict
+        Content fingerprint of each column of df1 (see ``fingerprint_column``)
+    df2_fingerprints : dict
+        Content fingerprint of each column of df2 (see ``fingerprint_column``)
     """
 
     def __init__(
@@ -82,10 +164,20 @@ class Compare(object):
         df1_name="df1",
         df2_name="df2",
         ignore_spaces=False,
+        n_jobs=1,
+        inplace=True,
+        n_partitions=1,
+        ignore_case=False,
+        datetime_tol=None,
+        stats_only=False,
+        sample_count=10,
+        lazy=False,
     ):
 
         if on_index and join_columns is not None:
             raise Exception("Only provide on_index or join_columns")
+        elif n_jobs == 0:
+            raise ValueError("n_jobs must not be 0: use None or 1 to compare columns serially")
         elif on_index:
             self.on_index = True
             self.join_columns = []
@@ -96,16 +188,34 @@ class Compare(object):
             self.join_columns = [col.lower() for col in join_columns]
             self.on_index = False
 
+        self._inplace = inplace
+        # Nothing is compared until both dataframes are set
+        self._lazy = True
         self._any_dupes = False
+        self._dupes = {}
+        self._factorized_keys = {}
+        self._key_hashes = {}
+        self._fingerprints = {}
+        self._column_hashes = {}
+        self._derived = {}
+        self._retained_samples = None
+        self._reset_results()
         self.df1 = df1
         self.df2 = df2
         self.df1_name = df1_name
         self.df2_name = df2_name
         self.abs_tol = abs_tol
         self.rel_tol = rel_tol
-        self.df1_unq_rows = self.df2_unq_rows = self.intersect_rows = None
-        self.column_stats = []
-        self._compare(ignore_spaces)
+        self.datetime_tol = datetime_tol
+        self.n_jobs = n_jobs
+        self.n_partitions = n_partitions
+        self._ignore_spaces = ignore_spaces
+        self._ignore_case = ignore_case
+        self._stats_only = stats_only
+        self._sample_count = sample_count
+        self._lazy = lazy
+        if not lazy:
+            self._run_comparison()
 
     @property
     def df1(self):
@@ -113,9 +223,13 @@ class Compare(object):
 
     @df1.setter
     def df1(self, df1):
-        """Check that it is a dataframe and has the join columns"""
+        """Check that it is a dataframe and has the join columns, and compare
+        it to df2 again (unless lazy)"""
+        self._check_rows_retained()
         self._df1 = df1
         self._validate_dataframe("df1")
+        if not self._lazy:
+            self._run_comparison()
 
     @property
     def df2(self):
@@ -123,9 +237,13 @@ class Compare(object):
 
     @df2.setter
     def df2(self, df2):
-        """Check that it is a dataframe and has the join columns"""
+        """Check that it is a dataframe and has the join columns, and compare
+        it to df1 again (unless lazy)"""
+        self._check_rows_retained()
         self._df2 = df2
         self._validate_dataframe("df2")
+        if not self._lazy:
+            self._run_comparison()
 
     def _validate_dataframe(self, index):
         """Check that it is a dataframe and has the join columns
@@ -139,7 +257,13 @@ class Compare(object):
         if not isinstance(dataframe, pd.DataFrame):
             raise TypeError("{} must be a pandas DataFrame".format(index))
 
-        dataframe.columns = [col.lower() for col in dataframe.columns]
+        columns = [col.lower() for col in dataframe.columns]
+        if self._inplace:
+            dataframe.columns = columns
+        elif list(dataframe.columns) != columns:
+            dataframe = dataframe.rename(columns=lambda col: col.lower(), copy=False)
+            setattr(self, "_" + index, dataframe)
+
         # Check if join_columns are present in the dataframe
         if not set(self.join_columns).issubset(set(dataframe.columns)):
             raise ValueError("{} must have all columns from join_columns".format(index))
@@ -147,25 +271,75 @@ class Compare(object):
         if len(set(dataframe.columns)) < len(dataframe.columns):
             raise ValueError("{} must have unique column names".format(index))
 
-        if self.on_index:
-            if dataframe.index.duplicated().sum() > 0:
-                self._any_dupes = True
-        else:
-            if len(dataframe.drop_duplicates(subset=self.join_columns)) < len(dataframe):
-                self._any_dupes = True
+        other = getattr(self, "_df2" if index == "df1" else "_df1", None)
+        if self.on_index and other is not None and other.index.nlevels != dataframe.index.nlevels:
+            raise ValueError("df1 and df2 must have the same number of index levels")
+
+        self._key_hashes.pop(index, None)
+        self._fingerprints[index] = {}
+        self._column_hashes[index] = {}
+
+        # Factorize the join keys once, for both the duplicate check and the join
+        self._factorized_keys[index] = factorize_keys(self._key_columns(dataframe))
+        codes, _ = combine_codes(
+            [codes for codes, _ in self._factorized_keys[index]],
+            [len(uniques) + 1 for _, uniques in self._factorized_keys[index]],
+        )
+        self._dupes[index] = len(codes) > 0 and np.bincount(codes).max() > 1
+        self._any_dupes = any(self._dupes.values())
+        self._reset_results()
+
+    def _reset_results(self):
+        """Forget the results of the comparison (and everything derived from
+        them), so that each phase runs again when it's next needed"""
+        self._phases = set()
+        self._intersect_idx1 = self._intersect_idx2 = None
+        self._df1_unq_idx = self._df2_unq_idx = None
+        self._df1_unq_rows = self._df2_unq_rows = self._intersect_rows = None
+        self._matched_columns = []
+        self._match_positions = {}
+        self._match_matrix = np.ones((0, 0), dtype=bool)
+        self._column_stats = []
+        self._identical_columns = set()
+        self._derived.clear()
 
-    def _compare(self, ignore_spaces):
-        """Actually run the comparison.  This tries to run df1.equals(df2)
-        first so that if they're truly equal we can tell.
+    @property
+    def column_stats(self):
+        """The statistics of each shared column, in df1's column order"""
+        self._run_comparison()
+        return self._column_stats
+
+    def _join(self):
+        """Run the join phase, which finds the rows that are in both df1 and
+        df2, only in df1 and only in df2, if it hasn't run yet"""
+        if "join" not in self._phases:
+            LOG.debug("Merging dataframes")
+            self._dataframe_merge(self._ignore_spaces)
+            self._phases.add("join")
+
+    def _run_comparison(self):
+        """Run the full comparison (and the join phase, if needed) if it hasn't
+        run yet, then release the data with ``stats_only``"""
+        if "compare" in self._phases:
+            return
+        # Queries made while comparing mustn't start the comparison again
+        self._phases.add("compare")
+        try:
+            self._compare(self._ignore_spaces, self._ignore_case)
+        except Exception:
+            self._phases.discard("compare")
+            raise
+        if self._stats_only:
+            self._retain_stats_only(self._sample_count)
+
+    def _compare(self, ignore_spaces, ignore_case):
+        """Actually run the comparison.  The per-row hashes of each column are
+        compared first, so that if df1 and df2 are truly equal we can tell
+        (and skip comparing the columns value by value).
 
         This method will log out information about what is different between
         the two dataframes, and will also return a boolean.
         """
-        LOG.debug("Checking equality")
-        if self.df1.equals(self.df2):
-            LOG.info("df1 Pandas.DataFrame.equals df2")
-        else:
-            LOG.info("df1 does not Pandas.DataFrame.equals df2")
         LOG.info("Number of columns in common: {0}".format(len(self.intersect_columns())))
         LOG.debug("Checking column overlap")
         for col in self.df1_unq_columns():
@@ -174,25 +348,113 @@ class Compare(object):
         for col in self.df2_unq_columns():
             LOG.info("Column in df2 and not in df1: {}".format(col))
         LOG.info("Number of columns in df2 and not in df1: {}".format(len(self.df2_unq_columns())))
-        LOG.debug("Merging dataframes")
-        self._dataframe_merge(ignore_spaces)
-        self._intersect_compare(ignore_spaces)
+        if self.n_partitions > 1:
+            self._partitioned_compare(ignore_spaces, ignore_case)
+            self._phases.add("join")
+        else:
+            self._join()
+            self._intersect_compare(ignore_spaces, ignore_case)
+        if self._identical_content():
+            LOG.info("df1 has identical content to df2")
+        else:
+            LOG.info("df1 does not have identical content to df2")
         if self.matches():
             LOG.info("df1 matches df2")
         else:
             LOG.info("df1 does not match df2")
 
+    def _identical_content(self):
+        """Check whether df1 and df2 hold exactly the same values for the same
+        keys: they have the same columns (with the same dtypes) and rows, and
+        the hashes of every compared column were equal on all the rows (see
+        ``_screen_column``).
+        """
+        self._run_comparison()
+
+        def identical():
+            if self._any_dupes or not self.all_columns_match():
+                return False
+            if len(self.df1.columns) == 0 or not self.all_rows_overlap():
+                return False
+            for column in self.df1.columns:
+                if self.df1[column].dtype != self.df2[column].dtype:
+                    return False
+            return set(self._compared_columns()) <= self._identical_columns
+
+        return self._memoized("identical_content", identical)
+
+    def _fingerprint(self, index, column):
+        """Get (and cache) the content fingerprint of a column of df1 or df2.
+
+        Parameters
+        ----------
+        index : str
+            The "index" of the dataframe - df1 or df2.
+        column : str
+            The column name
+        """
+        if column not in self._fingerprints[index]:
+            if index not in self._key_hashes:
+                self._key_hashes[index] = hash_keys(self._factorized_keys[index])
+            self._fingerprints[index][column] = fingerprint_hash(
+                self._column_hash(index, column), self._key_hashes[index]
+            )
+        return self._fingerprints[index][column]
+
+    def _column_hash(self, index, column):
+        """Get (and cache) the per-row hash of a column of df1 or df2 (see
+        ``hash_column``), which the fingerprints and the hash screening share.
+
+        Parameters
+        ----------
+        index : str
+            The "index" of the dataframe - df1 or df2.
+        column : str
+            The column name
+        """
+        if column not in self._column_hashes[index]:
+            self._column_hashes[index][column] = hash_column(getattr(self, index)[column])
+        return self._column_hashes[index][column]
+
+    @property
+    def df1_fingerprints(self):
+        return dict((column, self._fingerprint("df1", column)) for column in self.df1.columns)
+
+    @property
+    def df2_fingerprints(self):
+        return dict((column, self._fingerprint("df2", column)) for column in self.df2.columns)
+
+    def _memoized(self, name, compute):
+        """Get a result derived from df1, df2 and the comparison, computing
+        it with ``compute`` only the first time it's asked for (until df1 or
+        df2 is reassigned, or the comparison results are recorded again)"""
+        if name not in self._derived:
+            self._derived[name] = compute()
+        return self._derived[name]
+
     def df1_unq_columns(self):
         """Get columns that are unique to df1"""
-        return set(self.df1.columns) - set(self.df2.columns)
+        return set(
+            self._memoized(
+                "df1_unq_columns", lambda: frozenset(self.df1.columns) - set(self.df2.columns)
+            )
+        )
 
     def df2_unq_columns(self):
         """Get columns that are unique to df2"""
-        return set(self.df2.columns) - set(self.df1.columns)
+        return set(
+            self._memoized(
+                "df2_unq_columns", lambda: frozenset(self.df2.columns) - set(self.df1.columns)
+            )
+        )
 
     def intersect_columns(self):
         """Get columns that are shared between the two dataframes"""
-        return set(self.df1.columns) & set(self.df2.columns)
+        return set(
+            self._memoized(
+                "intersect_columns", lambda: frozenset(self.df1.columns) & set(self.df2.columns)
+            )
+        )
 
     def _dataframe_merge(self, ignore_spaces):
         """Merge df1 to df2 on the join columns, to get df1 - df2, df2 - df1
@@ -200,109 +462,305 @@ class Compare(object):
 
         If ``on_index`` is True, this will join on index values, otherwise it
         will join on the ``join_columns``.
+
+        Rather than running a suffixed outer merge, the join keys of both
+        dataframes are factorized into shared integer codes, and positional
+        indexers are computed for the rows that are only in df1, only in df2,
+        and in both.  Column data is only gathered from the original
+        dataframes when building the result frames.
         """
 
-        LOG.debug("Outer joining")
+        LOG.debug("Aligning join keys")
+        codes1, codes2, ngroups = align_keys(
+            self._factorized_keys["df1"], self._factorized_keys["df2"]
+        )
         if self._any_dupes:
             LOG.debug("Duplicate rows found, deduping by order of remaining fields")
-            # Bring index into a column
-            if self.on_index:
-                index_column = temp_column_name(self.df1, self.df2)
-                self.df1[index_column] = self.df1.index
-                self.df2[index_column] = self.df2.index
-                temp_join_columns = [index_column]
-            else:
-                temp_join_columns = list(self.join_columns)
-
-            # Create order column for uniqueness of match
-            order_column = temp_column_name(self.df1, self.df2)
-            self.df1[order_column] = (
-                self.df1.sort_values(by=list(self.df1.columns))
-                .groupby(temp_join_columns)
-                .cumcount()
+            # Pair up duplicates by their order within each key group
+            order = np.concatenate([dupe_order(self.df1, codes1), dupe_order(self.df2, codes2)])
+            codes, ngroups = combine_codes(
+                [np.concatenate([codes1, codes2]), order],
+                [ngroups, order.max() + 1 if len(order) else 1],
             )
-            self.df2[order_column] = (
-                self.df2.sort_values(by=list(self.df2.columns))
-                .groupby(temp_join_columns)
-                .cumcount()
+            codes1, codes2 = codes[: len(codes1)], codes[len(codes1) :]
+
+        LOG.debug("Outer joining")
+        (
+            self._intersect_idx1,
+            self._intersect_idx2,
+            self._df1_unq_idx,
+            self._df2_unq_idx,
+        ) = join_indexers(codes1, codes2, ngroups)
+
+        LOG.info("Number of rows in df1 and not in df2: {}".format(len(self._df1_unq_idx)))
+        LOG.info("Number of rows in df2 and not in df1: {}".format(len(self._df2_unq_idx)))
+        LOG.info(
+            "Number of rows in df1 and df2 (not necessarily equal): {}".format(
+                len(self._intersect_idx1)
             )
-            temp_join_columns.append(order_column)
+        )
 
-            params = {"on": temp_join_columns}
-        elif self.on_index:
-            params = {"left_index": True, "right_index": True}
-        else:
-            params = {"on": self.join_columns}
+    def _retain_stats_only(self, sample_count):
+        """Keep only the statistics and sample rows of the comparison, and
+        release the dataframes, row indexers and match matrix.
 
-        outer_join = self.df1.merge(
-            self.df2, how="outer", suffixes=("_df1", "_df2"), indicator=True, **params
-        )
+        Everything ``matches``, ``subset`` and ``report`` need is memoized
+        first, and up to ``sample_count`` random mismatching rows of each
+        column (and unique rows of each dataframe) are kept as samples.
 
-        # Clean up temp columns for duplicate row matching
-        if self._any_dupes:
-            if self.on_index:
-                outer_join.index = outer_join[index_column]
-                outer_join.drop(index_column, axis=1, inplace=True)
-                self.df1.drop(index_column, axis=1, inplace=True)
-                self.df2.drop(index_column, axis=1, inplace=True)
-            outer_join.drop(order_column, axis=1, inplace=True)
-            self.df1.drop(order_column, axis=1, inplace=True)
-            self.df2.drop(order_column, axis=1, inplace=True)
-
-        df1_cols = get_merged_columns(self.df1, outer_join, "_df1")
-        df2_cols = get_merged_columns(self.df2, outer_join, "_df2")
-
-        LOG.debug("Selecting df1 unique rows")
-        self.df1_unq_rows = outer_join[outer_join["_merge"] == "left_only"][df1_cols].copy()
-        self.df1_unq_rows.columns = self.df1.columns
-
-        LOG.debug("Selecting df2 unique rows")
-        self.df2_unq_rows = outer_join[outer_join["_merge"] == "right_only"][df2_cols].copy()
-        self.df2_unq_rows.columns = self.df2.columns
-        LOG.info("Number of rows in df1 and not in df2: {}".format(len(self.df1_unq_rows)))
-        LOG.info("Number of rows in df2 and not in df1: {}".format(len(self.df2_unq_rows)))
-
-        LOG.debug("Selecting intersecting rows")
-        self.intersect_rows = outer_join[outer_join["_merge"] == "both"].copy()
-        LOG.info(
-            "Number of rows in df1 and df2 (not necessarily equal): {}".format(
-                len(self.intersect_rows)
+        Parameters
+        ----------
+        sample_count : int
+            The number of sample rows to keep per column and per dataframe
+        """
+        LOG.debug("Releasing the data, keeping statistics and samples")
+        self.intersect_columns()
+        self.df1_unq_columns()
+        self.df2_unq_columns()
+        self.count_matching_rows()
+        self.intersect_rows_match()
+        self._row_counts()
+        self._retained_samples = {
+            "mismatch": dict(
+                (column, self.sample_mismatch(column, sample_count))
+                for column in self._matched_columns
+            ),
+            "df1": self._unq_rows_sample("df1", sample_count),
+            "df2": self._unq_rows_sample("df2", sample_count),
+        }
+        self._df1 = self._df2 = None
+        self._intersect_idx1 = self._intersect_idx2 = None
+        self._df1_unq_idx = self._df2_unq_idx = None
+        self._match_matrix = None
+        self._factorized_keys = {}
+        self._key_hashes = {}
+        self._fingerprints = {}
+        self._column_hashes = {}
+        # The key overlap holds the distinct keys themselves
+        self._derived.pop("key_overlap", None)
+
+    def _check_rows_retained(self):
+        if self._retained_samples is not None:
+            raise ValueError("Only statistics and samples are kept with stats_only=True")
+
+    @property
+    def df1_unq_rows(self):
+        """All records that are only in df1"""
+        self._check_rows_retained()
+        self._join()
+        if self._df1_unq_rows is None:
+            LOG.debug("Selecting df1 unique rows")
+            self._df1_unq_rows = self.df1.take(self._df1_unq_idx)
+            self._df1_unq_rows.index = self._result_index("df1", self._df1_unq_idx)
+        return self._df1_unq_rows
+
+    @property
+    def df2_unq_rows(self):
+        """All records that are only in df2"""
+        self._check_rows_retained()
+        self._join()
+        if self._df2_unq_rows is None:
+            LOG.debug("Selecting df2 unique rows")
+            self._df2_unq_rows = self.df2.take(self._df2_unq_idx)
+            self._df2_unq_rows.index = self._result_index("df2", self._df2_unq_idx)
+        return self._df2_unq_rows
+
+    @property
+    def intersect_rows(self):
+        """All records that are in both df1 and df2"""
+        self._check_rows_retained()
+        self._run_comparison()
+        if self._intersect_rows is None:
+            LOG.debug("Selecting intersecting rows")
+            rows = self._build_intersect_rows()
+            matches = pd.DataFrame(
+                self._match_matrix,
+                index=rows.index,
+                columns=[column + "_match" for column in self._matched_columns],
             )
+            self._intersect_rows = pd.concat([rows, matches], axis=1)
+        return self._intersect_rows
+
+    def _key_columns(self, dataframe):
+        """Get the values that ``dataframe`` is joined on, as a list of
+        array-likes (one per join column, or one per index level)"""
+        return key_columns(dataframe, self.join_columns, self.on_index)
+
+    def _result_index(self, index, indexer):
+        """Get the result index for the rows of df1 or df2 selected by
+        ``indexer``.
+
+        This mirrors the index an outer merge would have produced: the
+        original labels when joining on the index, otherwise the position of
+        the row in the outer join (df1 rows first, then the df2-only rows).
+
+        Parameters
+        ----------
+        index : str
+            The "index" of the dataframe - df1 or df2.
+        indexer : numpy.ndarray
+            The positions of the rows in the dataframe (for df2, only rows
+            that are unique to df2)
+        """
+        if self.on_index:
+            return getattr(self, index).index.take(indexer)
+        elif index == "df2":
+            return pd.Index(len(self.df1) + np.searchsorted(self._df2_unq_idx, indexer))
+        else:
+            return pd.Index(indexer)
+
+    def _build_intersect_rows(self):
+        """Gather the intersecting rows from df1 and df2 into one dataframe,
+        laid out like a suffixed outer merge of the two (``_df1`` / ``_df2``
+        suffixes on shared, non-join columns)."""
+        shared = self.intersect_columns()
+        df2_positions = [
+            i for i, col in enumerate(self.df2.columns) if col not in self.join_columns
+        ]
+
+        df1_part = self.df1.take(self._intersect_idx1)
+        df1_part.columns = [
+            col + "_df1" if col in shared and col not in self.join_columns else col
+            for col in self.df1.columns
+        ]
+        df2_part = self.df2.iloc[self._intersect_idx2, df2_positions]
+        df2_part.columns = [col + "_df2" if col in shared else col for col in df2_part.columns]
+
+        df1_part.index = df2_part.index = pd.RangeIndex(len(self._intersect_idx1))
+        intersect_rows = pd.concat([df1_part, df2_part], axis=1)
+        intersect_rows["_merge"] = pd.Categorical.from_codes(
+            np.full(len(intersect_rows), 2, dtype=np.int8),
+            categories=["left_only", "right_only", "both"],
+        )
+        intersect_rows.index = self._result_index("df1", self._intersect_idx1)
+        return intersect_rows
+
+    def _intersect_column(self, column, index, positions=None):
+        """Gather the df1 or df2 version of ``column`` for the intersecting
+        rows (or some of them), as a series with a plain positional index.
+
+        Parameters
+        ----------
+        column : str
+            The raw column name
+        index : str
+            The "index" of the dataframe - df1 or df2.
+        positions : numpy.ndarray, optional
+            The positions of the rows within the intersecting rows, if not all
+            of them
+        """
+        indexer = self._intersect_idx1 if index == "df1" else self._intersect_idx2
+        if positions is not None:
+            indexer = indexer[positions]
+        values = getattr(self, index)[column].take(indexer)
+        values.index = pd.RangeIndex(len(indexer))
+        return values
+
+    def _intersect_sample(self, column, positions):
+        """Gather the join columns and the df1 and df2 versions of ``column``
+        for some of the intersecting rows.
+
+        Parameters
+        ----------
+        column : str
+            The raw column name
+        positions : numpy.ndarray
+            The positions of the rows within the intersecting rows
+        """
+        indexer1 = self._intersect_idx1[positions]
+        indexer2 = self._intersect_idx2[positions]
+        sample = OrderedDict(
+            (col, self.df1[col].take(indexer1).values) for col in self.join_columns
         )
+        sample[column + "_df1"] = self.df1[column].take(indexer1).values
+        sample[column + "_df2"] = self.df2[column].take(indexer2).values
+        return pd.DataFrame(sample, index=self._result_index("df1", indexer1))
 
-    def _intersect_compare(self, ignore_spaces):
+    def _intersect_compare(self, ignore_spaces, ignore_case):
         """Run the comparison on the intersect dataframe
 
         This loops through all columns that are shared between df1 and df2, and
-        creates a column column_match which is True for matches, False
-        otherwise.
+        fills in their column of a match matrix (one row per intersecting row)
+        which is True for matches, False otherwise.  The ``_match`` columns of
+        ``intersect_rows`` are only built from it when they are accessed.
+
+        With ``n_jobs`` other than 1, the columns are compared concurrently on
+        a thread pool; the results are still collected in df1's column order.
         """
         LOG.debug("Comparing intersection")
-        row_cnt = len(self.intersect_rows)
-        for column in self.intersect_columns():
+        row_cnt = len(self._intersect_idx1)
+        compare_columns = self._compared_columns()
+        matrix = np.empty((row_cnt, len(compare_columns)), dtype=bool, order="F")
+        self._identical_columns = set()
+
+        # Each thread reuses one set of buffers for all its numeric columns
+        scratch = threading.local()
+
+        def compare_column(position):
+            if not hasattr(scratch, "buffers"):
+                scratch.buffers = ScratchBuffers()
+            column = compare_columns[position]
+            matrix[:, position], max_diff, null_diff = self._compare_column(
+                column, ignore_spaces, ignore_case, scratch.buffers
+            )
+            return max_diff, null_diff
+
+        try:
+            diffs = self._map(compare_column, list(range(len(compare_columns))))
+        finally:
+            # The per-row hashes are as big as the columns: don't keep them
+            for column_hashes in self._column_hashes.values():
+                column_hashes.clear()
+        self._record_results(compare_columns, matrix, diffs)
+
+    def _compared_columns(self):
+        """The shared columns that aren't join columns, in df1's column order"""
+        intersect_columns = self.intersect_columns()
+        return [
+            column
+            for column in self.df1.columns
+            if column in intersect_columns and column not in self.join_columns
+        ]
+
+    def _column_match(self, column):
+        """The match array of one compared column (a view of its column of
+        the match matrix)"""
+        return self._match_matrix[:, self._match_positions[column]]
+
+    def _record_results(self, columns, matrix, diffs):
+        """Store the match matrix of the compared columns, and log and append
+        the ``column_stats`` of every shared column in df1's column order.
+
+        Parameters
+        ----------
+        columns : list
+            The compared columns (see ``_compared_columns``)
+        matrix : numpy.ndarray
+            Whether each intersecting row (one per row) matches for each of
+            ``columns`` (one per column)
+        diffs : list
+            ``(max_diff, null_diff)`` for each of ``columns``
+        """
+        self._derived.clear()
+        self._matched_columns = columns
+        self._match_positions = dict((column, position) for position, column in enumerate(columns))
+        self._match_matrix = matrix
+        match_cnts = np.count_nonzero(matrix, axis=0)
+        row_cnt = len(self._intersect_idx1)
+        intersect_columns = self.intersect_columns()
+        for column in self.df1.columns:
+            if column not in intersect_columns:
+                continue
             if column in self.join_columns:
                 match_cnt = row_cnt
                 col_match = ""
                 max_diff = 0
                 null_diff = 0
             else:
-                col_1 = column + "_df1"
-                col_2 = column + "_df2"
                 col_match = column + "_match"
-                self.intersect_rows[col_match] = columns_equal(
-                    self.intersect_rows[col_1],
-                    self.intersect_rows[col_2],
-                    self.rel_tol,
-                    self.abs_tol,
-                    ignore_spaces,
-                )
-                match_cnt = self.intersect_rows[col_match].sum()
-                max_diff = calculate_max_diff(
-                    self.intersect_rows[col_1], self.intersect_rows[col_2]
-                )
-                null_diff = (
-                    (self.intersect_rows[col_1].isnull()) ^ (self.intersect_rows[col_2].isnull())
-                ).sum()
+                position = self._match_positions[column]
+                match_cnt = match_cnts[position]
+                max_diff, null_diff = diffs[position]
 
             if row_cnt > 0:
                 match_rate = float(match_cnt) / row_cnt
@@ -312,7 +770,7 @@ class Compare(object):
                 "{0}: {1} / {2} ({3:.2%}) match".format(column, match_cnt, row_cnt, match_rate)
             )
 
-            self.column_stats.append(
+            self._column_stats.append(
                 {
                     "column": column,
                     "match_column": col_match,
@@ -328,6 +786,288 @@ class Compare(object):
                 }
             )
 
+    def _partitioned_compare(self, ignore_spaces, ignore_case):
+        """Join and compare df1 and df2 partition by partition, in
+        ``n_partitions`` worker processes.
+
+        Rows are assigned to partitions by their aligned join key codes, so
+        all the rows for a key (including duplicates) land in the same
+        partition on both sides.  Each worker runs a normal ``Compare`` on its
+        partition, and the per-partition row indexers, match arrays and
+        statistics are then mapped back to positions in df1 and df2 and merged.
+        """
+        LOG.debug("Partitioning dataframes on their join keys")
+        codes1, codes2, _ = align_keys(self._factorized_keys["df1"], self._factorized_keys["df2"])
+        partitions1 = partition_positions(codes1 % self.n_partitions, self.n_partitions)
+        partitions2 = partition_positions(codes2 % self.n_partitions, self.n_partitions)
+        kwargs = {
+            "join_columns": None if self.on_index else self.join_columns,
+            "on_index": self.on_index,
+            "abs_tol": self.abs_tol,
+            "rel_tol": self.rel_tol,
+            "datetime_tol": self.datetime_tol,
+            "ignore_spaces": ignore_spaces,
+            "ignore_case": ignore_case,
+            "inplace": False,
+        }
+
+        shared1, blocks1 = _share_columns(self.df1)
+        shared2, blocks2 = _share_columns(self.df2)
+        try:
+            tasks = [
+                (
+                    _partition_spec(self.df1, shared1, positions1, self.on_index),
+                    _partition_spec(self.df2, shared2, positions2, self.on_index),
+                    kwargs,
+                )
+                for positions1, positions2 in zip(partitions1, partitions2)
+                if len(positions1) > 0 or len(positions2) > 0
+            ]
+            LOG.debug("Comparing {} partitions".format(len(tasks)))
+            # Spawned (rather than forked) workers don't inherit the registry
+            pool = Pool(
+                min(self.n_partitions, max(len(tasks), 1)),
+                _init_partition_worker,
+                (list(_registered_comparators),),
+            )
+            try:
+                results = pool.map(_compare_partition, tasks)
+            finally:
+                pool.close()
+                pool.join()
+        finally:
+            for block in blocks1 + blocks2:
+                block.close()
+                block.unlink()
+
+        def concat(arrays):
+            return np.concatenate([np.empty(0, dtype=np.intp)] + list(arrays))
+
+        intersect_idx1 = concat(result["intersect_idx1"] for result in results)
+        order = np.argsort(intersect_idx1, kind="mergesort")
+        self._intersect_idx1 = intersect_idx1[order]
+        self._intersect_idx2 = concat(result["intersect_idx2"] for result in results)[order]
+        self._df1_unq_idx = np.sort(concat(result["df1_unq_idx"] for result in results))
+        self._df2_unq_idx = np.sort(concat(result["df2_unq_idx"] for result in results))
+
+        LOG.info("Number of rows in df1 and not in df2: {}".format(len(self._df1_unq_idx)))
+        LOG.info("Number of rows in df2 and not in df1: {}".format(len(self._df2_unq_idx)))
+        LOG.info(
+            "Number of rows in df1 and df2 (not necessarily equal): {}".format(
+                len(self._intersect_idx1)
+            )
+        )
+
+        compare_columns = self._compared_columns()
+        matrix = np.concatenate(
+            [np.empty((0, len(compare_columns)), dtype=bool)]
+            + [result["match"] for result in results]
+        )
+        # Partitions without intersecting rows have a max_diff of 0, which
+        # mustn't hide the NaN of a column whose compared values are all null
+        compared = [result for result in results if len(result["intersect_idx1"]) > 0]
+        diffs = [
+            (
+                max_ignoring_nulls(*[result["max_diff"][column] for result in compared] or [0]),
+                sum(result["null_diff"][column] for result in results),
+            )
+            for column in compare_columns
+        ]
+        self._record_results(compare_columns, np.asfortranarray(matrix[order]), diffs)
+
+    def _map(self, func, items):
+        """Apply ``func`` to each of ``items``, on a pool of ``n_jobs`` threads
+        if there's more than one, and return the results in order.
+
+        Parameters
+        ----------
+        func : callable
+            The function to apply
+        items : list
+            The items to apply it to
+        """
+        if self.n_jobs is None:
+            n_jobs = 1
+        elif self.n_jobs < 0:
+            n_jobs = max(cpu_count() + 1 + self.n_jobs, 1)
+        else:
+            n_jobs = self.n_jobs
+        n_jobs = min(n_jobs, len(items))
+        if n_jobs <= 1:
+            return [func(item) for item in items]
+        pool = ThreadPool(n_jobs)
+        try:
+            return pool.map(func, items)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _compare_column(self, column, ignore_spaces, ignore_case, scratch=None):
+        """Compare the df1 and df2 versions of a column on the intersecting
+        rows.
+
+        The column is screened first (see ``_screen_column``): if no hashes
+        differ, every row matches without comparing any values.  Otherwise,
+        plain numeric (and datetime) columns are compared by a kernel which
+        gets the match, maximum difference and null difference in one pass,
+        categorical columns are only compared on the rows whose hashes differ,
+        and other columns on all the rows.
+
+        Parameters
+        ----------
+        column : str
+            The column name
+        ignore_spaces : bool
+            Flag to strip whitespace (including newlines) from string columns
+        ignore_case : bool
+            Flag to ignore the case of string columns
+        scratch : ScratchBuffers, optional
+            Buffers for comparing numeric columns in
+
+        Returns
+        -------
+        tuple
+            The match for each row (``numpy.ndarray`` of bool), the maximum
+            difference and the number of rows where only one value is null
+        """
+        col_1, col_2 = self.df1[column], self.df2[column]
+        row_cnt = len(self._intersect_idx1)
+        differ = self._screen_column(column)
+        if differ is not None and len(differ) == 0:
+            self._identical_columns.add(column)
+            max_diff = pd.Timedelta(0) if col_1.dtype.kind in "Mm" else 0
+            return np.ones(row_cnt, dtype=bool), max_diff, 0
+
+        # Datetimes (or timedeltas) get theirs in one pass on int64 views
+        if (
+            col_1.dtype.kind in "Mm"
+            and col_2.dtype.kind == col_1.dtype.kind
+            and get_comparator(col_1, col_2) is compare_datetimes
+            and (datetime_tz(col_1.dtype) is None) == (datetime_tz(col_2.dtype) is None)
+        ):
+            return compare_datetime_columns(
+                datetime_values(self._intersect_column(column, "df1")),
+                datetime_values(self._intersect_column(column, "df2")),
+                self.datetime_tol,
+            )
+
+        # Plain numeric columns get theirs in one chunked pass
+        if (
+            col_1.dtype.kind in "biuf"
+            and col_2.dtype.kind in "biuf"
+            and get_comparator(col_1, col_2) is compare_numeric
+        ):
+            return compare_numeric_values(
+                self._intersect_column(column, "df1"),
+                self._intersect_column(column, "df2"),
+                self.rel_tol,
+                self.abs_tol,
+                scratch=scratch,
+            )
+
+        # Other comparators can depend on the rest of the column (e.g. strings
+        # only compare as numbers if both columns only hold numbers), but
+        # categoricals are compared row by row, by their codes
+        if get_comparator(col_1, col_2) is not compare_categoricals:
+            differ = None
+        sub_1 = self._intersect_column(column, "df1", differ)
+        sub_2 = self._intersect_column(column, "df2", differ)
+        match = columns_equal(
+            sub_1, sub_2, self.rel_tol, self.abs_tol, ignore_spaces, ignore_case, self.datetime_tol
+        ).values
+        null_diff = ((sub_1.isnull()) ^ (sub_2.isnull())).sum()
+        max_diff = calculate_max_diff(sub_1, sub_2)
+        if differ is None:
+            return match, max_diff, null_diff
+
+        # Rows with equal hashes hold equal values, which differ by 0
+        if len(differ) < row_cnt:
+            max_diff = max_ignoring_nulls(max_diff, 0)
+        screened = np.ones(row_cnt, dtype=bool)
+        screened[differ] = match
+        return screened, max_diff, null_diff
+
+    def _screen_column(self, column):
+        """Compare the cached per-row hashes (see ``_column_hash``) of the df1
+        and df2 versions of a column on the intersecting rows.
+
+        Parameters
+        ----------
+        column : str
+            The column name
+
+        Returns
+        -------
+        numpy.ndarray or None
+            The positions, within the intersecting rows, of the rows whose
+            hashes differ, or None if the column isn't screened: its versions
+            have different dtypes, their values can't be hashed, or they're
+            numbers which would take longer to hash than to compare.
+        """
+        if self.df1[column].dtype != self.df2[column].dtype:
+            return None
+        values = self.df1[column].values
+        if values.dtype.kind in "biufcmM" and not (
+            isinstance(values, np.ndarray) and values.dtype.kind != "b" and values.itemsize == 8
+        ):
+            return None
+        hash_1 = self._column_hash("df1", column)
+        hash_2 = self._column_hash("df2", column) if hash_1 is not None else None
+        if hash_2 is None:
+            return None
+        return np.flatnonzero(
+            hash_1.take(self._intersect_idx1) != hash_2.take(self._intersect_idx2)
+        )
+
+    def _unq_rows_sample(self, index, sample_count):
+        """Get a random sample of (up to ``sample_count``) rows unique to df1
+        or df2, with their first 10 columns.
+
+        Parameters
+        ----------
+        index : str
+            The "index" of the dataframe - df1 or df2.
+        sample_count : int
+            The number of sample rows
+        """
+        if self._retained_samples is not None:
+            return self._retained_samples[index].head(sample_count)
+        self._join()
+        unq_idx = getattr(self, "_{}_unq_idx".format(index))
+        sample = np.random.choice(unq_idx, min(sample_count, len(unq_idx)), replace=False)
+        return self._unq_sample(index, sample)
+
+    def _row_counts(self):
+        """Get the shapes of df1 and df2, and the number of rows in both, only
+        in df1 and only in df2"""
+        self._join()
+        return self._memoized(
+            "row_counts",
+            lambda: {
+                "df1_shape": self.df1.shape,
+                "df2_shape": self.df2.shape,
+                "intersect": len(self._intersect_idx1),
+                "df1_unq": len(self._df1_unq_idx),
+                "df2_unq": len(self._df2_unq_idx),
+            },
+        )
+
+    def _unq_sample(self, index, indexer):
+        """Gather the first 10 columns of some of the rows that are unique to
+        df1 or df2.
+
+        Parameters
+        ----------
+        index : str
+            The "index" of the dataframe - df1 or df2.
+        indexer : numpy.ndarray
+            The positions of the rows in the dataframe
+        """
+        dataframe = getattr(self, index)
+        sample = dataframe.iloc[indexer, : min(10, dataframe.shape[1])]
+        sample.index = self._result_index(index, indexer)
+        return sample
+
     def all_columns_match(self):
         """Whether the columns all match in the dataframes"""
         return self.df1_unq_columns() == self.df2_unq_columns() == set()
@@ -341,7 +1081,36 @@ class Compare(object):
             True if all rows in df1 are in df2 and vice versa (based on
             existence for join option)
         """
-        return len(self.df1_unq_rows) == len(self.df2_unq_rows) == 0
+        return self._row_counts()["df1_unq"] == self._row_counts()["df2_unq"] == 0
+
+    def key_overlap(self):
+        """Get the distinct join keys that are only in df1, only in df2 and in
+        both, and how many there are of each.
+
+        Only the join keys, which are factorized when df1 and df2 are set,
+        are looked at: the dataframes aren't joined, even with ``lazy``.
+        With ``stats_only``, the keys are released with the data, so this
+        raises a ``ValueError`` once the comparison has run.
+
+        Returns
+        -------
+        dict
+            See ``key_overlap``
+        """
+        if self._retained_samples is not None:
+            raise ValueError(
+                "The join keys aren't kept with stats_only=True: call key_overlap() before "
+                "the comparison runs (with lazy=True), or use datacompy.key_overlap"
+            )
+        return self._memoized(
+            "key_overlap",
+            lambda: overlap_keys(
+                self._key_columns(self.df1),
+                self._key_columns(self.df2),
+                self._factorized_keys["df1"],
+                self._factorized_keys["df2"],
+            ),
+        )
 
     def count_matching_rows(self):
         """Count the number of rows match (on overlapping fields)
@@ -351,16 +1120,16 @@ class Compare(object):
         int
             Number of matching rows
         """
-        match_columns = []
-        for column in self.intersect_columns():
-            if column not in self.join_columns:
-                match_columns.append(column + "_match")
-        return self.intersect_rows[match_columns].all(axis=1).sum()
+        self._run_comparison()
+        return self._memoized(
+            "count_matching_rows",
+            lambda: np.count_nonzero(np.logical_and.reduce(self._match_matrix, axis=1)),
+        )
 
     def intersect_rows_match(self):
         """Check whether the intersect rows all match"""
-        actual_length = self.intersect_rows.shape[0]
-        return self.count_matching_rows() == actual_length
+        self._run_comparison()
+        return self._memoized("intersect_rows_match", lambda: self._match_matrix.all())
 
     def matches(self, ignore_extra_columns=False):
         """Return True or False if the dataframes match.
@@ -388,7 +1157,7 @@ class Compare(object):
         """
         if not self.df2_unq_columns() == set():
             return False
-        elif not len(self.df2_unq_rows) == 0:
+        elif not self._row_counts()["df2_unq"] == 0:
             return False
         elif not self.intersect_rows_match():
             return False
@@ -416,13 +1185,15 @@ class Compare(object):
             "pertinent" columns, for rows that don't match on the provided
             column.
         """
-        row_cnt = self.intersect_rows.shape[0]
-        col_match = self.intersect_rows[column + "_match"]
-        match_cnt = col_match.sum()
-        sample_count = min(sample_count, row_cnt - match_cnt)
-        sample = self.intersect_rows[~col_match].sample(sample_count)
-        return_cols = self.join_columns + [column + "_df1", column + "_df2"]
-        to_return = sample[return_cols]
+        self._run_comparison()
+        if self._retained_samples is not None:
+            to_return = self._retained_samples["mismatch"][column].head(sample_count).copy()
+        else:
+            mismatches = np.flatnonzero(~self._column_match(column))
+            sample_count = min(sample_count, len(mismatches))
+            to_return = self._intersect_sample(
+                column, np.random.choice(mismatches, sample_count, replace=False)
+            )
         if for_display:
             to_return.columns = self.join_columns + [
                 column + " (" + self.df1_name + ")",
@@ -444,13 +1215,16 @@ class Compare(object):
         str
             The report, formatted kinda nicely.
         """
+        self._run_comparison()
         # Header
         report = render("header.txt")
+        row_counts = self._row_counts()
+        df1_shape, df2_shape = row_counts["df1_shape"], row_counts["df2_shape"]
         df_header = pd.DataFrame(
             {
                 "DataFrame": [self.df1_name, self.df2_name],
-                "Columns": [self.df1.shape[1], self.df2.shape[1]],
-                "Rows": [self.df1.shape[0], self.df2.shape[0]],
+                "Columns": [df1_shape[1], df2_shape[1]],
+                "Rows": [df1_shape[0], df2_shape[0]],
             }
         )
         report += df_header[["DataFrame", "Columns", "Rows"]].to_string()
@@ -476,10 +1250,10 @@ class Compare(object):
             match_on,
             self.abs_tol,
             self.rel_tol,
-            self.intersect_rows.shape[0],
-            self.df1_unq_rows.shape[0],
-            self.df2_unq_rows.shape[0],
-            self.intersect_rows.shape[0] - self.count_matching_rows(),
+            row_counts["intersect"],
+            row_counts["df1_unq"],
+            row_counts["df2_unq"],
+            row_counts["intersect"] - self.count_matching_rows(),
             self.count_matching_rows(),
             self.df1_name,
             self.df2_name,
@@ -487,7 +1261,6 @@ class Compare(object):
         )
 
         # Column Matching
-        cnt_intersect = self.intersect_rows.shape[0]
         report += render(
             "column_comparison.txt",
             len([col for col in self.column_stats if col["unequal_cnt"] > 0]),
@@ -542,22 +1315,18 @@ class Compare(object):
                 report += sample.to_string()
                 report += "\n\n"
 
-        if self.df1_unq_rows.shape[0] > 0:
+        if row_counts["df1_unq"] > 0:
             report += "Sample Rows Only in {} (First 10 Columns)\n".format(self.df1_name)
             report += "---------------------------------------{}\n".format("-" * len(self.df1_name))
             report += "\n"
-            columns = self.df1_unq_rows.columns[:10]
-            unq_count = min(sample_count, self.df1_unq_rows.shape[0])
-            report += self.df1_unq_rows.sample(unq_count)[columns].to_string()
+            report += self._unq_rows_sample("df1", sample_count).to_string()
             report += "\n\n"
 
-        if self.df2_unq_rows.shape[0] > 0:
+        if row_counts["df2_unq"] > 0:
             report += "Sample Rows Only in {} (First 10 Columns)\n".format(self.df2_name)
             report += "---------------------------------------{}\n".format("-" * len(self.df2_name))
             report += "\n"
-            columns = self.df2_unq_rows.columns[:10]
-            unq_count = min(sample_count, self.df2_unq_rows.shape[0])
-            report += self.df2_unq_rows.sample(unq_count)[columns].to_string()
+            report += self._unq_rows_sample("df2", sample_count).to_string()
             report += "\n\n"
 
         return report
@@ -585,18 +1354,26 @@ def render(filename, *fields):
         return file_open.read().format(*fields)
 
 
-def columns_equal(col_1, col_2, rel_tol=0, abs_tol=0, ignore_spaces=False):
+def columns_equal(
+    col_1, col_2, rel_tol=0, abs_tol=0, ignore_spaces=False, ignore_case=False, datetime_tol=None
+):
     """Compares two columns from a dataframe, returning a True/False series,
     with the same index as column 1.
 
     - Two nulls (np.nan) will evaluate to True.
     - A null and a non-null value will evaluate to False.
     - Numeric values will use the relative and absolute tolerances.
-    - Decimal values (decimal.Decimal) will attempt to be converted to floats
-      before comparing
+    - Decimal values (decimal.Decimal) are compared exactly (or within the
+      tolerances) as pyarrow decimals, if pyarrow is installed.  Otherwise
+      they will attempt to be converted to floats before comparing
+    - Datetime (and timedelta) values are compared exactly, or within
+      ``datetime_tol``.  Timezone-aware datetimes never equal naive ones.
     - Non-numeric values (i.e. where np.isclose can't be used) will just
       trigger True on two nulls or exact matches.
 
+    The comparison itself is done by the comparator for the two columns'
+    dtypes (see ``get_comparator`` and ``register_comparator``).
+
     Parameters
     ----------
     col_1 : Pandas.Series
@@ -609,6 +1386,11 @@ def columns_equal(col_1, col_2, rel_tol=0, abs_tol=0, ignore_spaces=False):
         Absolute tolerance
     ignore_spaces : bool, optional
         Flag to strip whitespace (including newlines) from string columns
+    ignore_case : bool, optional
+        Flag to ignore the case of string columns
+    datetime_tol : pandas.Timedelta, optional
+        Tolerance between two datetime (or timedelta) values, or anything
+        ``pandas.Timedelta`` accepts, e.g. ``"1s"``
 
     Returns
     -------
@@ -616,48 +1398,26 @@ def columns_equal(col_1, col_2, rel_tol=0, abs_tol=0, ignore_spaces=False):
         A series of Boolean values.  True == the values match, False == the
         values don't match.
     """
-    try:
-        compare = pd.Series(np.isclose(col_1, col_2, rtol=rel_tol, atol=abs_tol, equal_nan=True))
-    except TypeError:
-        try:
-            compare = pd.Series(
-                np.isclose(
-                    col_1.astype(float),
-                    col_2.astype(float),
-                    rtol=rel_tol,
-                    atol=abs_tol,
-                    equal_nan=True,
-                )
-            )
-        except (ValueError, TypeError):
-            try:
-                if ignore_spaces:
-                    if col_1.dtype.kind == "O":
-                        col_1 = col_1.str.strip()
-                    if col_2.dtype.kind == "O":
-                        col_2 = col_2.str.strip()
-
-                if set([col_1.dtype.kind, col_2.dtype.kind]) == set(["M", "O"]):
-                    compare = compare_string_and_date_columns(col_1, col_2)
-                else:
-                    compare = pd.Series((col_1 == col_2) | (col_1.isnull() & col_2.isnull()))
-            except:
-                # Blanket exception should just return all False
-                compare = pd.Series(False, index=col_1.index)
-    compare.index = col_1.index
-    return compare
-
-
-def compare_string_and_date_columns(col_1, col_2):
+    comparator = get_comparator(col_1, col_2)
+    compare = comparator(col_1, col_2, rel_tol, abs_tol, ignore_spaces, ignore_case, datetime_tol)
+    return pd.Series(np.asarray(compare, dtype=bool), index=col_1.index)
+
+
+def compare_string_and_date_columns(col_1, col_2, datetime_tol=None):
     """Compare a string column and date column, value-wise.  This tries to
     convert a string column to a date column and compare that way.
 
+    Only the distinct strings are parsed (see ``parse_dates``), and the
+    dates are compared as int64 nanoseconds.
+
     Parameters
     ----------
     col_1 : Pandas.Series
         The first column to look at
     col_2 : Pandas.Series
         The second column
+    datetime_tol : pandas.Timedelta, optional
+        Tolerance between the parsed and the actual dates
 
     Returns
     -------
@@ -665,87 +1425,1609 @@ def compare_string_and_date_columns(col_1, col_2):
         A series of Boolean values.  True == the values match, False == the
         values don't match.
     """
-    if col_1.dtype.kind == "O":
-        obj_column = col_1
-        date_column = col_2
-    else:
+    if col_1.dtype.kind == "M" or datetime_tz(col_1.dtype) is not None:
         obj_column = col_2
         date_column = col_1
+    else:
+        obj_column = col_1
+        date_column = col_2
 
+    codes, uniques = pd.factorize(obj_column.values)
     try:
-        return pd.Series(
-            (pd.to_datetime(obj_column) == date_column)
-            | (obj_column.isnull() & date_column.isnull())
-        )
-    except:
+        parsed = parse_dates(np.asarray(uniques, dtype=object))
+    except (ValueError, TypeError, OverflowError):
         return pd.Series(False, index=col_1.index)
 
+    date_values = datetime_values(date_column)
+    date_null = pd.isnull(date_values)
+    if (parsed.tz is None) != (datetime_tz(date_column.dtype) is None):
+        # Timezone-aware dates never equal naive ones
+        return pd.Series((codes == -1) & date_null, index=col_1.index)
+    # NaT for the nulls' code of -1
+    nanos = np.append(nanoseconds(parsed.values), pd.NaT.value).take(codes)
+    match = compare_datetime_columns(nanos.view("datetime64[ns]"), date_values, datetime_tol)[0]
+    match &= ~date_null
+    match |= (codes == -1) & date_null
+    return pd.Series(match, index=col_1.index)
 
-def get_merged_columns(original_df, merged_df, suffix):
-    """Gets the columns from an original dataframe, in the new merged dataframe
 
-    Parameters
-    ----------
-    original_df : Pandas.DataFrame
-        The original, pre-merge dataframe
-    merged_df : Pandas.DataFrame
-        Post-merge with another dataframe, with suffixes added in.
-    suffix : str
-        What suffix was used to distinguish when the original dataframe was
-        overlapping with the other merged dataframe.
-    """
-    columns = []
-    for col in original_df.columns:
-        if col in merged_df.columns:
-            columns.append(col)
-        elif col + suffix in merged_df.columns:
-            columns.append(col + suffix)
-        else:
-            raise ValueError("Column not found: %s", col)
-    return columns
+def nanoseconds(values):
+    """View (naive or UTC) datetime64 or timedelta64 values as int64
+    nanoseconds"""
+    values = np.asarray(values)
+    unit = "timedelta64[ns]" if values.dtype.kind == "m" else "datetime64[ns]"
+    return values.astype(unit, copy=False).view("i8")
 
 
-def temp_column_name(*dataframes):
-    """Gets a temp column name that isn't included in columns of any dataframes
+def parse_dates(strings):
+    """Parse strings as datetimes.  The format is guessed (if possible) from
+    the first string and used for all of them, unless they don't all match
+    it.
 
     Parameters
     ----------
-    dataframes : list of Pandas.DataFrame
-        The DataFrames to create a temporary column name for
+    strings : numpy.ndarray
+        The strings to parse, which mustn't be null
 
     Returns
     -------
-    str
-        String column name that looks like '_temp_x' for some integer x
+    pandas.DatetimeIndex
+        The datetimes
     """
-    i = 0
-    while True:
-        temp_column = "_temp_{}".format(i)
-        unique = True
-        for dataframe in dataframes:
-            if temp_column in dataframe.columns:
-                i += 1
-                unique = False
-        if unique:
-            return temp_column
+    date_format = None
+    if guess_datetime_format is not None and len(strings) > 0:
+        date_format = guess_datetime_format(strings[0])
+    if date_format is not None:
+        try:
+            return pd.DatetimeIndex(pd.to_datetime(strings, format=date_format))
+        except (ValueError, TypeError):
+            pass
+    return pd.DatetimeIndex(pd.to_datetime(strings))
 
 
-def calculate_max_diff(col_1, col_2):
-    """Get a maximum difference between two columns
+def column_kind(column):
+    """Classify a column for picking its comparator: one of "numeric",
+    "bool", "decimal", "datetime", "timedelta", "string", "category" or
+    "object".
+
+    Object columns are classified by the (non-null) values they hold.
+    Nullable extension dtypes (e.g. ``Int64``, ``boolean``, ``string`` and
+    Arrow-backed dtypes) are classified like their numpy counterparts.
 
     Parameters
     ----------
-    col_1 : Pandas.Series
-        The first column
-    col_2 : Pandas.Series
-        The second column
+    column : Pandas.Series
+        The column to classify
 
     Returns
     -------
-    Numeric
-        Numeric field, or zero.
+    str
+        The kind of the column
+    """
+    kind = column.dtype.kind
+    if is_string_extension(column.dtype):
+        return "string"
+    if kind == "b":
+        return "bool"
+    if kind in "iufc":
+        return "numeric"
+    if kind == "M" or datetime_tz(column.dtype) is not None:
+        return "datetime"
+    if kind == "m":
+        return "timedelta"
+    if column.dtype.name == "category":
+        return "category"
+    if kind == "O" and column.dtype == object:
+        inferred = pd.api.types.infer_dtype(column, skipna=True)
+        if inferred in ("string", "empty"):
+            return "string"
+        if inferred in ("integer", "floating", "mixed-integer-float"):
+            return "numeric"
+        if inferred == "boolean":
+            return "bool"
+        if inferred == "decimal":
+            return "decimal"
+    return "object"
+
+
+def compare_numeric(col_1, col_2, rel_tol, abs_tol, ignore_spaces, ignore_case, datetime_tol=None):
+    """Comparator for numbers (including bools and decimals): compare within
+    the tolerances, and treat two nulls as equal."""
+    decimals = decimal_arrays(col_1, col_2)
+    if decimals is not None:
+        return compare_decimal_columns(decimals[0], decimals[1], rel_tol, abs_tol)[0]
+    if col_1.dtype.kind in "iu" and col_2.dtype.kind in "iu":
+        return compare_numeric_values(col_1, col_2, rel_tol, abs_tol)[0]
+    return np.isclose(
+        numeric_values(col_1), numeric_values(col_2), rtol=rel_tol, atol=abs_tol, equal_nan=True
+    )
+
+
+def compare_datetimes(
+    col_1, col_2, rel_tol, abs_tol, ignore_spaces, ignore_case, datetime_tol=None
+):
+    """Comparator for two datetime (or two timedelta) columns: compare within
+    ``datetime_tol``, two nulls are equal, and timezone-aware values never
+    equal naive ones (see ``compare_datetime_columns``)."""
+    values_1, values_2 = datetime_values(col_1), datetime_values(col_2)
+    if (datetime_tz(col_1.dtype) is None) != (datetime_tz(col_2.dtype) is None):
+        return pd.isnull(values_1) & pd.isnull(values_2)
+    return compare_datetime_columns(values_1, values_2, datetime_tol)[0]
+
+
+def compare_strings_and_dates(
+    col_1, col_2, rel_tol, abs_tol, ignore_spaces, ignore_case, datetime_tol=None
+):
+    """Comparator for a string column and a datetime column (see
+    ``compare_string_and_date_columns``)."""
+    col_1, col_2 = normalize_columns(col_1, col_2, ignore_spaces, ignore_case)
+    return compare_string_and_date_columns(col_1, col_2, datetime_tol).values
+
+
+def compare_categoricals(
+    col_1, col_2, rel_tol, abs_tol, ignore_spaces, ignore_case, datetime_tol=None
+):
+    """Comparator for two categorical columns: the categories of both are
+    matched up by value, and the rows compared by their codes, so the values
+    themselves are never materialized.  Numeric categories are compared
+    within the tolerances."""
+    categories_1, categories_2 = normalize_columns(
+        pd.Series(col_1.cat.categories), pd.Series(col_2.cat.categories), ignore_spaces, ignore_case
+    )
+    codes_1, codes_2 = col_1.cat.codes.values, col_2.cat.codes.values
+    numeric = categories_1.dtype.kind in "iuf" and categories_2.dtype.kind in "iuf"
+    if numeric and (rel_tol or abs_tol):
+        # NaN for the nulls' code of -1
+        values_1 = np.append(categories_1.values.astype(float), np.nan).take(codes_1)
+        values_2 = np.append(categories_2.values.astype(float), np.nan).take(codes_2)
+        return np.isclose(values_1, values_2, rtol=rel_tol, atol=abs_tol, equal_nan=True)
+    # Number the categories of both columns by value, and nulls -1
+    numbers, _ = pd.factorize(
+        np.concatenate(
+            [np.asarray(categories_1, dtype=object), np.asarray(categories_2, dtype=object)]
+        )
+    )
+    numbers_1 = np.append(numbers[: len(categories_1)], -1)
+    numbers_2 = np.append(numbers[len(categories_1) :], -1)
+    return numbers_1.take(codes_1) == numbers_2.take(codes_2)
+
+
+def compare_objects(col_1, col_2, rel_tol, abs_tol, ignore_spaces, ignore_case, datetime_tol=None):
+    """Comparator for everything else (strings, mixed objects...): values
+    have to be equal, except that if both columns only hold numbers (or
+    strings of numbers) they are compared as numbers, within the tolerances.
     """
+    normalized_1, normalized_2 = normalize_columns(col_1, col_2, ignore_spaces, ignore_case)
+    match = compare_values(
+        np.asarray(normalized_1, dtype=object), np.asarray(normalized_2, dtype=object)
+    )
+    return compare_as_numbers(col_1, col_2, match, rel_tol, abs_tol)
+
+
+def compare_as_numbers(col_1, col_2, match, rel_tol, abs_tol):
+    """Redo a comparison of two columns as numbers, within the tolerances,
+    if it found unequal values and both columns only hold numbers (or
+    strings of numbers).  Otherwise return the ``match`` as it was."""
+    if match.all() or not (col_1.dtype.kind in "biufcO" and col_2.dtype.kind in "biufcO"):
+        return match
+    # Only parse the whole columns once the first few unequal values, and
+    # then all of them, parse
+    unequal = np.flatnonzero(~match)
+    for positions in (unequal[:8], unequal):
+        for column in (col_1, col_2):
+            if numeric_values(column.take(positions), coerce=True) is None:
+                return match
+    numbers_1 = numeric_values(col_1, coerce=True)
+    numbers_2 = numeric_values(col_2, coerce=True) if numbers_1 is not None else None
+    if numbers_2 is None:
+        return match
+    return np.isclose(numbers_1, numbers_2, rtol=rel_tol, atol=abs_tol, equal_nan=True)
+
+
+def compare_strings(col_1, col_2, rel_tol, abs_tol, ignore_spaces, ignore_case, datetime_tol=None):
+    """Comparator for two string columns.  If they need normalizing and
+    their values repeat, the values are factorized into one shared
+    dictionary, so that normalizing (or parsing numbers, as in
+    ``compare_objects``) happens once per distinct value and rows are
+    compared by integer code.  Otherwise see ``compare_objects``.
+
+    Nullable (and Arrow-backed) string columns are normalized and compared by
+    pandas (or pyarrow) directly, without converting them to objects."""
+    if col_1.dtype != object or col_2.dtype != object:
+        normalized_1, normalized_2 = normalize_columns(col_1, col_2, ignore_spaces, ignore_case)
+        values_1, values_2 = normalized_1.values, normalized_2.values
+        if type(values_1) is type(values_2):
+            match = fill_nulls(values_1 == values_2)
+            match |= col_1.isnull().values & col_2.isnull().values
+        else:
+            # e.g. Arrow-backed strings don't compare to python-backed ones
+            match = compare_values(
+                np.asarray(values_1, dtype=object), np.asarray(values_2, dtype=object)
+            )
+        return compare_as_numbers(col_1, col_2, match, rel_tol, abs_tol)
+    if not (ignore_spaces or ignore_case) or not has_repeats(col_1):
+        return compare_objects(
+            col_1, col_2, rel_tol, abs_tol, ignore_spaces, ignore_case, datetime_tol
+        )
+    codes, uniques = pd.factorize(
+        np.concatenate([np.asarray(col_1, dtype=object), np.asarray(col_2, dtype=object)])
+    )
+    if ignore_spaces or ignore_case:
+        normalized = normalize_strings(pd.Series(uniques, dtype=object), ignore_spaces, ignore_case)
+        normalized_codes, uniques = pd.factorize(normalized.values)
+        codes = np.append(normalized_codes, -1).take(codes)  # nulls keep a code of -1
+    codes_1, codes_2 = codes[: len(col_1)], codes[len(col_1) :]
+    match = codes_1 == codes_2
+    if match.all():
+        return match
+
+    # Strings of numbers compare as numbers, if that's all both columns hold
+    unequal = np.unique(np.concatenate([codes_1[~match][:8], codes_2[~match][:8]]))
+    unequal = pd.Series(uniques.take(unequal[unequal >= 0]), dtype=object)
+    if numeric_values(unequal, coerce=True) is None:
+        return match
+    numbers = numeric_values(pd.Series(uniques, dtype=object), coerce=True)
+    if numbers is None:
+        return match
+    numbers = np.append(numbers, np.nan)  # for the nulls' code of -1
+    return np.isclose(
+        numbers.take(codes_1), numbers.take(codes_2), rtol=rel_tol, atol=abs_tol, equal_nan=True
+    )
+
+
+def has_repeats(column, sample_size=10000):
+    """Check whether the values at the start of a column mostly repeat, i.e.
+    whether it's worth handling its distinct values rather than its rows."""
+    sample = column.values[:sample_size]
+    return len(pd.unique(sample)) <= len(sample) // 2
+
+
+def compare_values(values_1, values_2):
+    """Compare two arrays value by value, treating two nulls as equal.  If the
+    values don't compare to one bool each (e.g. they're arrays themselves),
+    they're compared pair by pair instead (see ``values_equal``)."""
+    null_1 = pd.isnull(values_1)
+    null_2 = pd.isnull(values_2)
+    match = null_1 & null_2
+    both = ~(null_1 | null_2)
+    values_1, values_2 = values_1[both], values_2[both]
     try:
-        return (col_1.astype(float) - col_2.astype(float)).abs().max()
-    except:
-        return 0
+        equal = np.asarray(values_1 == values_2)
+    except (ValueError, TypeError):
+        equal = None
+    if equal is None or equal.dtype != bool or equal.shape != values_1.shape:
+        equal = np.fromiter(
+            (values_equal(value_1, value_2) for value_1, value_2 in zip(values_1, values_2)),
+            dtype=bool,
+            count=len(values_1),
+        )
+    match[both] = equal
+    return match
+
+
+def values_equal(value_1, value_2):
+    """Compare two values, which don't match if they don't compare to a bool
+    (e.g. arrays with more than one element)"""
+    try:
+        return bool(value_1 == value_2)
+    except (ValueError, TypeError):
+        return False
+
+
+def numeric_values(column, coerce=False):
+    """Get the values of a numeric (or bool or decimal) column as numbers.
+
+    With ``coerce``, object columns are parsed as numbers, and None is
+    returned if any of their non-null values isn't one.  Strings like "nan"
+    and "NaN" are parsed as NaN.
+    """
+    if column.dtype.kind in "iufc":
+        return numeric_array(column)
+    if column.dtype.kind == "b":
+        return numeric_array(column).astype(float)
+    if not coerce:
+        return column.astype(float).values
+    if is_string_extension(column.dtype):
+        column = column.astype(object)
+    elif column.dtype != object:
+        return None
+    numbers = pd.to_numeric(column, errors="coerce")
+    if numbers.dtype.kind not in "iufcb":
+        return None
+    unparsed = (numbers.isnull() & column.notnull()).values
+    if unparsed.any():
+        try:
+            column.values[unparsed].astype(float)
+        except (ValueError, TypeError):
+            return None
+    return numbers.values.astype(float)
+
+
+def numeric_array(column):
+    """Get the values of a numeric (or bool) column as a numpy array.
+    Nullable extension arrays are converted to floats, with NaN for nulls,
+    straight from their values and validity mask (or by pyarrow, if they're
+    Arrow-backed, rounding integers beyond 2**53).
+    """
+    values = column.values
+    if isinstance(values, np.ndarray):
+        return values
+    array = arrow_array(column)
+    if array is not None:
+        return np.asarray(array.cast(pyarrow.float64(), safe=False).to_numpy(), dtype=np.float64)
+    mask = getattr(values, "_mask", None)
+    if mask is not None:
+        floats = values._data.astype(np.float64)
+        floats[mask] = np.nan
+        return floats
+    return np.asarray(values, dtype=np.float64)
+
+
+def integer_values(column):
+    """Get the values of an integer column (plain, nullable or Arrow-backed)
+    as a numpy integer array and a null mask, without converting them to
+    floats.
+
+    Returns
+    -------
+    tuple or None
+        The values (with arbitrary values where they're null) and a bool
+        array which is True where they're null, or None if there are no
+        nulls.  None if the column doesn't hold integers.
+    """
+    values = column.values
+    if isinstance(values, np.ndarray):
+        return (values, None) if values.dtype.kind in "iu" else None
+    array = arrow_array(column)
+    if array is not None:
+        if not pyarrow.types.is_integer(array.type):
+            return None
+        nulls = array.is_null().to_numpy() if array.null_count else None
+        return np.asarray(pyarrow.compute.fill_null(array, 0).to_numpy()), nulls
+    data = getattr(values, "_data", None)
+    if isinstance(data, np.ndarray) and data.dtype.kind in "iu":
+        return data, values._mask
+    return None
+
+
+def datetime_values(column):
+    """Get the values of a datetime (or timedelta) column as a numpy
+    ``datetime64`` (or ``timedelta64``) array, in UTC if timezone-aware"""
+    values = column.values
+    if isinstance(values, np.ndarray):
+        return values
+    array = arrow_array(column)
+    if array is not None:
+        return np.asarray(array.to_numpy())
+    return np.asarray(values.to_numpy(dtype="datetime64[ns]", na_value=np.datetime64("NaT")))
+
+
+def datetime_tz(dtype):
+    """Get the timezone of a datetime dtype, or None if it's naive"""
+    tz = getattr(dtype, "tz", None)
+    if tz is None:
+        tz = getattr(getattr(dtype, "pyarrow_dtype", None), "tz", None)
+    return tz
+
+
+def arrow_array(column):
+    """Get the pyarrow ``ChunkedArray`` behind an Arrow-backed column, or
+    None if it isn't one"""
+    if getattr(column.dtype, "pyarrow_dtype", None) is None:
+        if getattr(column.dtype, "storage", None) != "pyarrow":
+            return None
+    return column.values.__arrow_array__()
+
+
+def is_string_extension(dtype):
+    """Check whether a dtype is a nullable (or Arrow-backed) string dtype"""
+    string_dtype = getattr(pd, "StringDtype", None)
+    if string_dtype is not None and isinstance(dtype, string_dtype):
+        return True
+    pyarrow_dtype = getattr(dtype, "pyarrow_dtype", None)
+    if pyarrow_dtype is None:
+        return False
+    return pyarrow.types.is_string(pyarrow_dtype) or pyarrow.types.is_large_string(pyarrow_dtype)
+
+
+def fill_nulls(values, fill=False):
+    """Convert a (possibly nullable) array of bools to a numpy array, with
+    nulls replaced by ``fill``"""
+    if isinstance(values, np.ndarray):
+        return values.astype(bool)
+    return np.asarray(pd.Series(values).fillna(fill), dtype=bool)
+
+
+def normalize_columns(col_1, col_2, ignore_spaces, ignore_case):
+    """Normalize the strings in two columns (see ``normalize_strings``)"""
+    return (
+        normalize_strings(col_1, ignore_spaces, ignore_case),
+        normalize_strings(col_2, ignore_spaces, ignore_case),
+    )
+
+
+def normalize_strings(column, ignore_spaces=False, ignore_case=False):
+    """Strip whitespace from and/or lowercase the strings in a column,
+    leaving other values as they are.
+
+    Parameters
+    ----------
+    column : Pandas.Series
+        The column to normalize
+    ignore_spaces : bool, optional
+        Flag to strip whitespace (including newlines)
+    ignore_case : bool, optional
+        Flag to lowercase
+
+    Returns
+    -------
+    Pandas.Series
+        The normalized column
+    """
+    if not (ignore_spaces or ignore_case):
+        return column
+    if is_string_extension(column.dtype):
+        if getattr(column.dtype, "pyarrow_dtype", None) is None:
+            normalized = column.str.strip() if ignore_spaces else column
+            return normalized.str.lower() if ignore_case else normalized
+        array = arrow_array(column)
+        if ignore_spaces:
+            array = pyarrow.compute.utf8_trim_whitespace(array)
+        if ignore_case:
+            array = pyarrow.compute.utf8_lower(array)
+        return pd.Series(type(column.values)(array), index=column.index, name=column.name)
+    if column.dtype != object:
+        return column
+    if pd.api.types.infer_dtype(column, skipna=True) not in ("string", "mixed", "mixed-integer"):
+        return column
+    normalized = column
+    if ignore_spaces:
+        normalized = normalized.str.strip()
+    if ignore_case:
+        normalized = normalized.str.lower()
+    return normalized.where(normalized.notnull(), column)
+
+
+# Built-in comparators, by the pair of column kinds (see ``column_kind``)
+KIND_COMPARATORS = {}
+for _kind_1 in ("numeric", "bool", "decimal"):
+    for _kind_2 in ("numeric", "bool", "decimal"):
+        KIND_COMPARATORS[_kind_1, _kind_2] = compare_numeric
+KIND_COMPARATORS["datetime", "datetime"] = compare_datetimes
+KIND_COMPARATORS["timedelta", "timedelta"] = compare_datetimes
+KIND_COMPARATORS["string", "string"] = compare_strings
+KIND_COMPARATORS["datetime", "string"] = compare_strings_and_dates
+KIND_COMPARATORS["string", "datetime"] = compare_strings_and_dates
+KIND_COMPARATORS["category", "category"] = compare_categoricals
+
+# Comparators added with ``register_comparator``, most recent first
+_registered_comparators = []
+
+
+def register_comparator(check, comparator):
+    """Register a comparator for ``columns_equal`` (and so ``Compare``) to use
+    on the pairs of columns it applies to.  Comparators registered later take
+    precedence, and all of them take precedence over the built-in ones.
+
+    Parameters
+    ----------
+    check : callable
+        Called with the dtypes of the two columns, returns True if
+        ``comparator`` applies to them
+    comparator : callable
+        Called with
+        ``(col_1, col_2, rel_tol, abs_tol, ignore_spaces, ignore_case, datetime_tol)``,
+        returns an array of bools which is True where the values of the two
+        columns (Pandas.Series of the same length) match
+    """
+    _registered_comparators.insert(0, (check, comparator))
+
+
+def get_comparator(col_1, col_2):
+    """Get the comparator to compare two columns with: the latest registered
+    one which applies to their dtypes, or else the built-in one for their
+    kinds (falling back to ``compare_objects``).
+
+    Parameters
+    ----------
+    col_1 : Pandas.Series
+        The first column
+    col_2 : Pandas.Series
+        The second column
+
+    Returns
+    -------
+    callable
+        The comparator
+    """
+    for check, comparator in _registered_comparators:
+        if check(col_1.dtype, col_2.dtype):
+            return comparator
+    kinds = (column_kind(col_1), column_kind(col_2))
+    return KIND_COMPARATORS.get(kinds, compare_objects)
+
+
+def get_merged_columns(original_df, merged_df, suffix):
+    """Gets the columns from an original dataframe, in the new merged dataframe
+
+    Parameters
+    ----------
+    original_df : Pandas.DataFrame
+        The original, pre-merge dataframe
+    merged_df : Pandas.DataFrame
+        Post-merge with another dataframe, with suffixes added in.
+    suffix : str
+        What suffix was used to distinguish when the original dataframe was
+        overlapping with the other merged dataframe.
+    """
+    columns = []
+    for col in original_df.columns:
+        if col in merged_df.columns:
+            columns.append(col)
+        elif col + suffix in merged_df.columns:
+            columns.append(col + suffix)
+        else:
+            raise ValueError("Column not found: %s", col)
+    return columns
+
+
+def temp_column_name(*dataframes):
+    """Gets a temp column name that isn't included in columns of any dataframes
+
+    Parameters
+    ----------
+    dataframes : list of Pandas.DataFrame
+        The DataFrames to create a temporary column name for
+
+    Returns
+    -------
+    str
+        String column name that looks like '_temp_x' for some integer x
+    """
+    i = 0
+    while True:
+        temp_column = "_temp_{}".format(i)
+        unique = True
+        for dataframe in dataframes:
+            if temp_column in dataframe.columns:
+                i += 1
+                unique = False
+        if unique:
+            return temp_column
+
+
+def calculate_max_diff(col_1, col_2):
+    """Get a maximum difference between two columns
+
+    Parameters
+    ----------
+    col_1 : Pandas.Series
+        The first column
+    col_2 : Pandas.Series
+        The second column
+
+    Returns
+    -------
+    Numeric
+        Numeric field (a ``pandas.Timedelta`` for datetimes or timedeltas), or
+        zero.
+    """
+    decimals = decimal_arrays(col_1, col_2)
+    if decimals is not None:
+        return compare_decimal_columns(decimals[0], decimals[1])[1]
+    if col_1.dtype.kind in "iu" and col_2.dtype.kind in "iu":
+        return compare_numeric_values(col_1, col_2)[1]
+    if (
+        col_1.dtype != object
+        and col_2.dtype != object
+        and get_comparator(col_1, col_2) is compare_datetimes
+        and (datetime_tz(col_1.dtype) is None) == (datetime_tz(col_2.dtype) is None)
+    ):
+        return compare_datetime_columns(datetime_values(col_1), datetime_values(col_2))[1]
+    numbers_1 = max_diff_numbers(col_1)
+    numbers_2 = max_diff_numbers(col_2) if numbers_1 is not None else None
+    if numbers_2 is None:
+        return 0
+    with np.errstate(invalid="ignore"):
+        return pd.Series(np.abs(numbers_1 - numbers_2)).max()
+
+
+def max_diff_numbers(column, sample_size=8):
+    """Get the values of a column as numbers for ``calculate_max_diff``, or
+    None if it doesn't hold numbers.  Numeric (and bool and decimal) columns
+    are converted, and string columns are only parsed if their first
+    ``sample_size`` values are numbers."""
+    kind = column_kind(column)
+    if kind in ("numeric", "bool", "decimal"):
+        return numeric_values(column)
+    if kind != "string" or numeric_values(column.iloc[:sample_size], coerce=True) is None:
+        return None
+    return numeric_values(column, coerce=True)
+
+
+class ScratchBuffers(object):
+    """Chunk-sized scratch arrays for ``compare_numeric_columns``, so that
+    comparing column after column doesn't allocate any temporaries.  A set of
+    buffers must only be used by one thread at a time.
+
+    Parameters
+    ----------
+    chunk_size : int, optional
+        The number of rows the buffers hold
+    """
+
+    def __init__(self, chunk_size=NUMERIC_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.values_1 = np.empty(chunk_size, dtype=np.float64)
+        self.values_2 = np.empty(chunk_size, dtype=np.float64)
+        self.diff = np.empty(chunk_size, dtype=np.float64)
+        self.tolerance = np.empty(chunk_size, dtype=np.float64)
+        self.null_1 = np.empty(chunk_size, dtype=bool)
+        self.null_2 = np.empty(chunk_size, dtype=bool)
+        self.flag = np.empty(chunk_size, dtype=bool)
+        self.high = np.empty(chunk_size, dtype=np.int64)
+        self.low = np.empty(chunk_size, dtype=np.int64)
+
+
+def compare_numeric_columns(
+    values_1, values_2, rel_tol=0, abs_tol=0, chunk_size=NUMERIC_CHUNK_SIZE, scratch=None
+):
+    """Compare two numeric (or bool) arrays in a single pass, a chunk of
+    rows at a time, returning the same match as ``columns_equal``, maximum
+    difference as ``calculate_max_diff`` and null difference as ``Compare``
+    would compute separately.
+
+    Parameters
+    ----------
+    values_1 : numpy.ndarray
+        The first column's values
+    values_2 : numpy.ndarray
+        The second column's values
+    rel_tol : float, optional
+        Relative tolerance
+    abs_tol : float, optional
+        Absolute tolerance
+    chunk_size : int, optional
+        The number of rows to work on at a time, if ``scratch`` isn't given
+    scratch : ScratchBuffers, optional
+        Buffers to work in (and whose ``chunk_size`` to use), otherwise
+        they're allocated for this call
+
+    Returns
+    -------
+    tuple
+        The match for each row (``numpy.ndarray`` of bool), the maximum
+        absolute difference (NaN if there are no non-null differences) and
+        the number of rows where only one value is null
+    """
+    length = len(values_1)
+    if scratch is None:
+        scratch = ScratchBuffers(max(min(chunk_size, length), 1))
+    chunk_size = scratch.chunk_size
+    match = np.empty(length, dtype=bool)
+    max_diff = np.nan
+    null_diff = 0
+    with np.errstate(invalid="ignore", over="ignore"):
+        for start in range(0, length, chunk_size):
+            chunk_1 = values_1[start : start + chunk_size]
+            chunk_2 = values_2[start : start + chunk_size]
+            rows = len(chunk_1)
+            if chunk_1.dtype != np.float64:
+                chunk_1 = _copy_to(scratch.values_1[:rows], chunk_1)
+            if chunk_2.dtype != np.float64:
+                chunk_2 = _copy_to(scratch.values_2[:rows], chunk_2)
+            chunk_match = match[start : start + chunk_size]
+            diff = scratch.diff[:rows]
+            tolerance = scratch.tolerance[:rows]
+            null_1 = scratch.null_1[:rows]
+            null_2 = scratch.null_2[:rows]
+            flag = scratch.flag[:rows]
+
+            np.subtract(chunk_1, chunk_2, out=diff)
+            np.abs(diff, out=diff)
+            max_diff = np.fmax(max_diff, np.fmax.reduce(diff))
+
+            # Like np.isclose(..., equal_nan=True): finite values within the
+            # tolerances, or equal infinities, or two nulls
+            np.abs(chunk_2, out=tolerance)
+            np.multiply(tolerance, rel_tol, out=tolerance)
+            np.add(tolerance, abs_tol, out=tolerance)
+            np.less_equal(diff, tolerance, out=chunk_match)
+            chunk_match &= np.isfinite(diff, out=flag)
+            chunk_match |= np.equal(chunk_1, chunk_2, out=flag)
+            np.isnan(chunk_1, out=null_1)
+            np.isnan(chunk_2, out=null_2)
+            chunk_match |= np.logical_and(null_1, null_2, out=flag)
+            null_diff += np.count_nonzero(np.not_equal(null_1, null_2, out=flag))
+    return match, max_diff, null_diff
+
+
+def compare_numeric_values(col_1, col_2, rel_tol=0, abs_tol=0, scratch=None):
+    """Compare two numeric (or bool) columns with the kernel that fits them:
+    ``compare_integer_columns`` on the values and null masks of integer
+    columns (plain, nullable or Arrow-backed) of compatible signedness,
+    otherwise ``compare_numeric_columns`` on their values as floats.
+
+    Parameters
+    ----------
+    col_1 : Pandas.Series
+        The first column
+    col_2 : Pandas.Series
+        The second column
+    rel_tol : float, optional
+        Relative tolerance
+    abs_tol : float, optional
+        Absolute tolerance
+    scratch : ScratchBuffers, optional
+        Buffers to work in
+
+    Returns
+    -------
+    tuple
+        See ``compare_numeric_columns``
+    """
+    integers_1 = integer_values(col_1)
+    integers_2 = integer_values(col_2) if integers_1 is not None else None
+    if integers_2 is not None:
+        if numeric_kernel(integers_1[0], integers_2[0]) is compare_integer_columns:
+            return compare_integer_columns(
+                integers_1[0],
+                integers_2[0],
+                rel_tol,
+                abs_tol,
+                scratch=scratch,
+                null_1=integers_1[1],
+                null_2=integers_2[1],
+            )
+    return compare_numeric_columns(
+        numeric_array(col_1), numeric_array(col_2), rel_tol, abs_tol, scratch=scratch
+    )
+
+
+def numeric_kernel(values_1, values_2):
+    """Pick the function to compare two numeric arrays with:
+    ``compare_integer_columns`` if they're both integers of compatible
+    signedness, otherwise ``compare_numeric_columns``."""
+    if (
+        isinstance(values_1, np.ndarray)
+        and isinstance(values_2, np.ndarray)
+        and values_1.dtype.kind in "iu"
+        and values_2.dtype.kind in "iu"
+        and np.result_type(values_1, values_2).kind in "iu"
+    ):
+        return compare_integer_columns
+    return compare_numeric_columns
+
+
+def compare_integer_columns(
+    values_1,
+    values_2,
+    rel_tol=0,
+    abs_tol=0,
+    chunk_size=NUMERIC_CHUNK_SIZE,
+    scratch=None,
+    null_1=None,
+    null_2=None,
+):
+    """Compare two integer arrays like ``compare_numeric_columns``, but in
+    integer arithmetic, so that values beyond 2**53 are compared (and their
+    differences computed) exactly.  Only a relative tolerance needs floats,
+    and only for checking the differences against it.
+
+    Parameters
+    ----------
+    values_1 : numpy.ndarray
+        The first column's values
+    values_2 : numpy.ndarray
+        The second column's values (not unsigned if the first are signed
+        64-bit integers, or vice versa)
+    rel_tol : float, optional
+        Relative tolerance
+    abs_tol : float, optional
+        Absolute tolerance
+    chunk_size : int, optional
+        The number of rows to work on at a time, if ``scratch`` isn't given
+    scratch : ScratchBuffers, optional
+        Buffers to work in (and whose ``chunk_size`` to use), otherwise
+        they're allocated for this call
+    null_1 : numpy.ndarray, optional
+        Where the first column's values are null (e.g. the mask of a
+        nullable integer column), if any are
+    null_2 : numpy.ndarray, optional
+        Where the second column's values are null, if any are
+
+    Returns
+    -------
+    tuple
+        The match for each row (``numpy.ndarray`` of bool), the maximum
+        absolute difference as an int (NaN if there are no non-null
+        differences) and the number of rows where only one value is null
+    """
+    length = len(values_1)
+    if scratch is None:
+        scratch = ScratchBuffers(max(min(chunk_size, length), 1))
+    chunk_size = scratch.chunk_size
+    unsigned = np.result_type(values_1, values_2).kind == "u"
+    # Differences in the unsigned type, where they can't overflow
+    if abs_tol < 0:
+        abs_limit = None
+    else:
+        abs_limit = np.uint64(min(np.floor(abs_tol), np.iinfo(np.uint64).max))
+    match = np.empty(length, dtype=bool)
+    max_diff = None
+    null_diff = 0
+    with np.errstate(over="ignore"):
+        for start in range(0, length, chunk_size):
+            chunk_1 = values_1[start : start + chunk_size]
+            chunk_2 = values_2[start : start + chunk_size]
+            rows = len(chunk_1)
+            chunk_match = match[start : start + chunk_size]
+            high = scratch.high[:rows]
+            low = scratch.low[:rows]
+            if unsigned:
+                high, low = high.view(np.uint64), low.view(np.uint64)
+
+            # Rows where either value is null, and where both are
+            either = both = None
+            if null_1 is not None and null_2 is not None:
+                either = np.logical_or(
+                    null_1[start : start + chunk_size],
+                    null_2[start : start + chunk_size],
+                    out=scratch.null_1[:rows],
+                )
+                both = np.logical_and(
+                    null_1[start : start + chunk_size],
+                    null_2[start : start + chunk_size],
+                    out=scratch.null_2[:rows],
+                )
+                null_diff += np.count_nonzero(either) - np.count_nonzero(both)
+            elif null_1 is not None or null_2 is not None:
+                either = (null_1 if null_1 is not None else null_2)[start : start + chunk_size]
+                null_diff += np.count_nonzero(either)
+
+            np.maximum(chunk_1, chunk_2, out=high)
+            np.minimum(chunk_1, chunk_2, out=low)
+            # Wraps around for signed values, but is exact once unsigned
+            diff = np.subtract(high, low, out=high).view(np.uint64)
+            if either is not None:
+                diff[either] = 0
+            if rows and (either is None or np.count_nonzero(either) < rows):
+                chunk_max = int(diff.max())
+                max_diff = chunk_max if max_diff is None else max(max_diff, chunk_max)
+
+            np.equal(chunk_1, chunk_2, out=chunk_match)
+            if rel_tol:
+                tolerance = scratch.tolerance[:rows]
+                np.abs(_copy_to(scratch.values_2[:rows], chunk_2), out=tolerance)
+                np.multiply(tolerance, rel_tol, out=tolerance)
+                np.add(tolerance, abs_tol, out=tolerance)
+                float_diff = _copy_to(scratch.diff[:rows], diff)
+                chunk_match |= np.less_equal(float_diff, tolerance, out=scratch.flag[:rows])
+            elif abs_limit is not None:
+                chunk_match |= np.less_equal(diff, abs_limit, out=scratch.flag[:rows])
+            if either is not None:
+                chunk_match[either] = False
+            if both is not None:
+                chunk_match |= both
+    max_diff = np.nan if max_diff is None else max_diff
+    return match, max_diff, null_diff
+
+
+def compare_datetime_columns(values_1, values_2, datetime_tol=None):
+    """Compare two datetime64 (or two timedelta64) arrays on their int64
+    nanoseconds, returning the same match as ``columns_equal``, maximum
+    difference as ``calculate_max_diff`` and null difference as ``Compare``
+    would compute separately.
+
+    Parameters
+    ----------
+    values_1 : numpy.ndarray
+        The first column's values
+    values_2 : numpy.ndarray
+        The second column's values
+    datetime_tol : pandas.Timedelta, optional
+        Tolerance between two values, or anything ``pandas.Timedelta``
+        accepts.  Values have to be equal by default.
+
+    Returns
+    -------
+    tuple
+        The match for each row (``numpy.ndarray`` of bool), the maximum
+        absolute difference as a ``pandas.Timedelta`` (NaT if there are no
+        non-null differences) and the number of rows where only one value is
+        null
+    """
+    nanos_1, nanos_2 = nanoseconds(values_1), nanoseconds(values_2)
+    null_1 = nanos_1 == pd.NaT.value
+    null_2 = nanos_2 == pd.NaT.value
+    valid = ~(null_1 | null_2)
+    # Differences as unsigned, where they can't overflow
+    with np.errstate(over="ignore"):
+        high, low = np.maximum(nanos_1, nanos_2), np.minimum(nanos_1, nanos_2)
+        diff = np.subtract(high, low).view(np.uint64)
+    tolerance = 0 if datetime_tol is None else max(pd.Timedelta(datetime_tol).value, 0)
+    match = (diff <= np.uint64(tolerance)) & valid
+    match |= null_1 & null_2
+    max_diff = pd.NaT
+    if valid.any():
+        diff[~valid] = 0
+        max_diff = pd.Timedelta(int(min(diff.max(), np.iinfo(np.int64).max)))
+    return match, max_diff, int(np.count_nonzero(null_1 ^ null_2))
+
+
+def decimal_arrays(col_1, col_2):
+    """Convert two columns of ``decimal.Decimal`` values to pyarrow decimal
+    arrays of one type, for ``compare_decimal_columns``.  The scale is
+    inferred from the first few values of each column.
+
+    Parameters
+    ----------
+    col_1 : Pandas.Series
+        The first column
+    col_2 : Pandas.Series
+        The second column
+
+    Returns
+    -------
+    tuple or None
+        The two ``pyarrow.Decimal128Array``, or None if pyarrow isn't
+        installed, either column doesn't hold decimals or some of their
+        values don't fit the inferred type.
+    """
+    if pyarrow is None or col_1.dtype != object or col_2.dtype != object:
+        return None
+    samples = [column.values[:DECIMAL_SAMPLE_SIZE] for column in (col_1, col_2)]
+    if any(pd.api.types.infer_dtype(sample, skipna=True) != "decimal" for sample in samples):
+        return None
+    try:
+        # pyarrow rejects infinite (and NaN) decimals, which then compare as floats
+        scale = max(pyarrow.array(sample, from_pandas=True).type.scale for sample in samples)
+        # One digit short of the maximum precision, so that differences fit too
+        decimal_type = pyarrow.decimal128(37, min(scale, 37))
+        return _to_decimal_array(col_1, decimal_type), _to_decimal_array(col_2, decimal_type)
+    except (pyarrow.ArrowException, TypeError, ValueError):
+        return None
+
+
+def _to_decimal_array(column, decimal_type):
+    try:
+        return pyarrow.array(column.values, type=decimal_type)
+    except (pyarrow.ArrowException, TypeError):
+        # NaN nulls are only recognised (at twice the cost) with from_pandas
+        return pyarrow.array(column.values, type=decimal_type, from_pandas=True)
+
+
+def compare_decimal_columns(values_1, values_2, rel_tol=0, abs_tol=0):
+    """Compare two decimal arrays exactly (or within the tolerances), and get
+    the maximum difference and null differences, without converting each
+    value to a float.
+
+    Parameters
+    ----------
+    values_1 : pyarrow.Decimal128Array
+        The first column's values
+    values_2 : pyarrow.Decimal128Array
+        The second column's values, of the same type
+    rel_tol : float, optional
+        Relative tolerance
+    abs_tol : float, optional
+        Absolute tolerance
+
+    Returns
+    -------
+    tuple
+        The match for each row (``numpy.ndarray`` of bool), the maximum
+        (absolute) difference as a float and the number of rows where only
+        one value is null
+    """
+    null_1 = values_1.is_null().to_numpy(zero_copy_only=False)
+    null_2 = values_2.is_null().to_numpy(zero_copy_only=False)
+    equal = pyarrow.compute.fill_null(pyarrow.compute.equal(values_1, values_2), False)
+    match = equal.to_numpy(zero_copy_only=False) | (null_1 & null_2)
+    diff = pyarrow.compute.abs(pyarrow.compute.subtract(values_1, values_2))
+    if rel_tol or abs_tol:
+        tolerance = abs_tol + rel_tol * np.abs(
+            values_2.cast(pyarrow.float64()).to_numpy(zero_copy_only=False)
+        )
+        with np.errstate(invalid="ignore"):
+            match |= diff.cast(pyarrow.float64()).to_numpy(zero_copy_only=False) <= tolerance
+    max_diff = pyarrow.compute.max(diff).as_py()
+    max_diff = np.nan if max_diff is None else float(max_diff)
+    return match, max_diff, int((null_1 ^ null_2).sum())
+
+
+def _copy_to(buffer, values):
+    """Copy values into a (float) buffer, converting them as needed"""
+    np.copyto(buffer, values, casting="unsafe")
+    return buffer
+
+
+def max_ignoring_nulls(*values):
+    """Get the largest of some values, ignoring nulls (returns the first
+    value if they are all null)"""
+    not_null = [value for value in values if not pd.isnull(value)]
+    if not not_null:
+        return values[0]
+    return max(not_null)
+
+
+def partition_positions(partitions, n_partitions):
+    """Split row positions up by partition number.
+
+    Parameters
+    ----------
+    partitions : numpy.ndarray
+        The partition number of each row, from 0 to ``n_partitions`` - 1
+    n_partitions : int
+        The number of partitions
+
+    Returns
+    -------
+    list of numpy.ndarray
+        The (ascending) positions of the rows in each partition
+    """
+    order = np.argsort(partitions, kind="mergesort")
+    bounds = np.searchsorted(partitions[order], np.arange(n_partitions + 1))
+    return [order[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def _share_columns(dataframe):
+    """Copy the plain numpy columns of a dataframe into shared memory blocks.
+
+    Returns a dict of ``(block name, dtype)`` by column name, and the list of
+    blocks, which the caller must close and unlink.  Nothing is shared if
+    ``multiprocessing.shared_memory`` isn't available.
+    """
+    shared = {}
+    blocks = []
+    if shared_memory is None:
+        return shared, blocks
+    for column in dataframe.columns:
+        values = dataframe[column].values
+        if not isinstance(values, np.ndarray) or values.dtype.kind not in "biufcmM":
+            continue
+        if values.dtype != dataframe[column].dtype:
+            continue
+        block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        blocks.append(block)
+        np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+        shared[column] = (block.name, values.dtype)
+    return shared, blocks
+
+
+def _partition_spec(dataframe, shared, positions, on_index):
+    """Describe one partition of a dataframe for ``_compare_partition``:
+    shared columns by block name, everything else by value."""
+    columns = []
+    for column in dataframe.columns:
+        if column in shared:
+            columns.append((column, shared[column], None))
+        else:
+            columns.append((column, None, dataframe[column].array.take(positions)))
+    index = dataframe.index.take(positions) if on_index else None
+    return columns, index, positions, len(dataframe)
+
+
+def _build_partition(spec):
+    """Build the dataframe for one partition from its ``_partition_spec``"""
+    columns, index, positions, length = spec
+    data = OrderedDict()
+    for column, block_info, values in columns:
+        if block_info is not None:
+            name, dtype = block_info
+            block = shared_memory.SharedMemory(name=name)
+            try:
+                buffer = np.ndarray((length,), dtype=dtype, buffer=block.buf)
+                values = buffer.take(positions)
+                del buffer
+            finally:
+                block.close()
+        data[column] = values
+    return pd.DataFrame(data, index=index, columns=[column for column, _, _ in columns])
+
+
+def _init_partition_worker(registered_comparators):
+    """Set up a worker process with the comparators registered in the parent
+    (see ``register_comparator``)."""
+    _registered_comparators[:] = registered_comparators
+
+
+def _compare_partition(task):
+    """Join and compare one partition of df1 and df2 (in a worker process),
+    with positions mapped back to the whole dataframes."""
+    spec1, spec2, kwargs = task
+    compare = Compare(_build_partition(spec1), _build_partition(spec2), **kwargs)
+    positions1, positions2 = spec1[2], spec2[2]
+    column_stats = dict((stats["column"], stats) for stats in compare.column_stats)
+    return {
+        "intersect_idx1": positions1[compare._intersect_idx1],
+        "intersect_idx2": positions2[compare._intersect_idx2],
+        "df1_unq_idx": positions1[compare._df1_unq_idx],
+        "df2_unq_idx": positions2[compare._df2_unq_idx],
+        "match": compare._match_matrix,
+        "max_diff": dict((column, stats["max_diff"]) for column, stats in column_stats.items()),
+        "null_diff": dict((column, stats["null_diff"]) for column, stats in column_stats.items()),
+    }
+
+
+def factorize_keys(keys):
+    """Factorize the key column(s) of a dataframe into integer codes.
+
+    Nulls get their own code (one past the last unique value), so that they
+    are treated as equal to each other, as they are in a ``merge``.
+
+    Parameters
+    ----------
+    keys : list of array-like
+        The key column(s) of the dataframe
+
+    Returns
+    -------
+    list of tuple
+        For each key column, the codes (``numpy.ndarray``) and the unique
+        values they refer to
+    """
+    factorized = []
+    for key in keys:
+        codes, uniques = pd.factorize(key)
+        codes[codes == -1] = len(uniques)
+        factorized.append((codes, uniques))
+    return factorized
+
+
+def combine_codes(key_codes, sizes):
+    """Combine the codes of several key columns into one code per row.
+
+    Parameters
+    ----------
+    key_codes : list of numpy.ndarray
+        The codes for each key column
+    sizes : list of int
+        An upper bound on the codes of each key column
+
+    Returns
+    -------
+    tuple
+        The combined codes (``numpy.ndarray``), and an upper bound on them
+        (int)
+    """
+    codes, ngroups = key_codes[0], sizes[0]
+    for column_codes, size in zip(key_codes[1:], sizes[1:]):
+        codes, uniques = pd.factorize(codes * size + column_codes)
+        ngroups = len(uniques)
+    return codes, ngroups
+
+
+def align_keys(factorized1, factorized2):
+    """Map the factorized keys of two dataframes onto shared integer codes.
+
+    Rows from either dataframe get the same code if and only if they have the
+    same values in every key column.  Only the unique values of each key
+    column are looked up, so the keys themselves aren't hashed again.
+
+    Parameters
+    ----------
+    factorized1 : list of tuple
+        The factorized keys of the first dataframe, from ``factorize_keys``
+    factorized2 : list of tuple
+        The factorized keys of the second dataframe, from ``factorize_keys``
+
+    Returns
+    -------
+    tuple
+        The codes for the rows of the first dataframe, the codes for the rows
+        of the second dataframe (both ``numpy.ndarray``), and an upper bound
+        on the codes (int)
+
+    Raises
+    ------
+    ValueError
+        If a key column of one dataframe can't be joined to the other's (see
+        ``coerce_key_uniques``)
+    """
+    key_codes = []
+    sizes = []
+    for (codes1, uniques1), (codes2, uniques2) in zip(factorized1, factorized2):
+        uniques1, uniques2 = coerce_key_uniques(uniques1, uniques2)
+        mapping = pd.Index(uniques1).get_indexer(uniques2)
+        missing = mapping == -1
+        mapping[missing] = len(uniques1) + np.arange(missing.sum())
+        size = len(uniques1) + missing.sum()
+        # Nulls get the last code, on both sides
+        codes1 = np.where(codes1 == len(uniques1), size, codes1)
+        mapping = np.append(mapping, size)
+        key_codes.append(np.concatenate([codes1, mapping[codes2]]))
+        sizes.append(int(size) + 1)
+
+    codes, ngroups = combine_codes(key_codes, sizes)
+    len1 = len(factorized1[0][0])
+    return codes[:len1], codes[len1:], ngroups
+
+
+def coerce_key_uniques(uniques1, uniques2):
+    """Check that two key columns can be joined, and cast their unique values
+    to a shared dtype where ``merge`` would.
+
+    As in ``merge``, numbers can't be joined to strings, and dates and times
+    can only be joined to dates and times (with or without a timezone, on
+    both sides).  Booleans are joined to numbers as 0 and 1.
+
+    Parameters
+    ----------
+    uniques1 : array-like
+        The unique values of the first key column, from ``factorize_keys``
+    uniques2 : array-like
+        The unique values of the second key column, from ``factorize_keys``
+
+    Returns
+    -------
+    tuple
+        ``uniques1`` and ``uniques2``, cast if needed
+
+    Raises
+    ------
+    ValueError
+        If the key columns can't be joined
+    """
+    dtype1, dtype2 = [
+        uniques.categories.dtype if uniques.dtype.name == "category" else uniques.dtype
+        for uniques in (uniques1, uniques2)
+    ]
+    if len(uniques1) == 0 or len(uniques2) == 0 or pd.api.types.is_dtype_equal(dtype1, dtype2):
+        return uniques1, uniques2
+
+    message = (
+        "You are trying to merge on {} and {} columns. If you wish to proceed you should use "
+        "pd.concat".format(uniques1.dtype, uniques2.dtype)
+    )
+    bool1, bool2 = pd.api.types.is_bool_dtype(dtype1), pd.api.types.is_bool_dtype(dtype2)
+    number1, number2 = [
+        pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        for dtype in (dtype1, dtype2)
+    ]
+    if (number1 and dtype2 == object and is_string_like(uniques2)) or (
+        number2 and dtype1 == object and is_string_like(uniques1)
+    ):
+        raise ValueError(message)
+    if is_datetimelike(dtype1) != is_datetimelike(dtype2) or (
+        getattr(dtype1, "tz", None) is None
+    ) != (getattr(dtype2, "tz", None) is None):
+        raise ValueError(message)
+
+    if bool1 and number2:
+        uniques1 = np.asarray(uniques1, dtype=np.int64)
+    elif bool2 and number1:
+        uniques2 = np.asarray(uniques2, dtype=np.int64)
+    return uniques1, uniques2
+
+
+def is_string_like(values):
+    """Check whether an object array holds strings (or a mix of types), which
+    ``merge`` won't join to numbers"""
+    return pd.api.types.infer_dtype(values, skipna=True) in ("string", "unicode", "bytes", "mixed")
+
+
+def is_datetimelike(dtype):
+    """Check whether a dtype holds dates, times or periods, which ``merge``
+    only joins to each other"""
+    return (
+        pd.api.types.is_datetime64_any_dtype(dtype)
+        or pd.api.types.is_timedelta64_dtype(dtype)
+        or pd.api.types.is_period_dtype(dtype)
+    )
+
+
+def dupe_order(dataframe, codes):
+    """Get the position of each row within its group of duplicated keys.
+
+    Within a group, rows are ordered by the values of all of their columns
+    (nulls last), so that duplicates in two dataframes are paired up
+    deterministically.  Only the rows in duplicated groups are sorted; every
+    other row is first (and only) in its group.
+
+    Parameters
+    ----------
+    dataframe : Pandas.DataFrame
+        The dataframe the rows come from
+    codes : numpy.ndarray
+        The factorized join keys of ``dataframe``
+
+    Returns
+    -------
+    numpy.ndarray
+        The order of each row within its key group, starting from 0
+    """
+    order = np.zeros(len(codes), dtype=np.int64)
+    dupe_rows = np.flatnonzero(np.bincount(codes)[codes] > 1)
+    if len(dupe_rows) == 0:
+        return order
+
+    dupes = dataframe.take(dupe_rows)
+    dupe_codes = codes[dupe_rows]
+    sort_keys = [dupe_codes] + [sort_codes(dupes.iloc[:, i]) for i in range(dupes.shape[1])]
+    sorter = np.lexsort(sort_keys[::-1])
+    sorted_codes = dupe_codes[sorter]
+    positions = np.arange(len(sorted_codes))
+    starts = np.ones(len(sorted_codes), dtype=bool)
+    starts[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    first = np.maximum.accumulate(np.where(starts, positions, 0))
+    order[dupe_rows[sorter]] = positions - first
+    return order
+
+
+def sort_codes(column):
+    """Get integer codes for a column which sort the same way its values do,
+    with nulls sorted last.
+
+    Parameters
+    ----------
+    column : Pandas.Series
+        The column to encode
+
+    Returns
+    -------
+    numpy.ndarray
+        The codes for each value of the column
+    """
+    codes, uniques = pd.factorize(column, sort=True)
+    codes[codes == -1] = len(uniques)
+    return codes
+
+
+def join_indexers(codes1, codes2, ngroups):
+    """Get positional indexers describing an outer join of two sets of unique
+    join key codes.
+
+    Parameters
+    ----------
+    codes1 : numpy.ndarray
+        The (unique) join key codes of the first dataframe
+    codes2 : numpy.ndarray
+        The (unique) join key codes of the second dataframe
+    ngroups : int
+        An upper bound on the codes
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        The positions in the first and second dataframes of the rows that
+        are in both (aligned with each other), the positions of the rows only
+        in the first dataframe, and the positions of the rows only in the
+        second dataframe
+    """
+    positions2 = np.full(ngroups, -1, dtype=np.intp)
+    positions2[codes2] = np.arange(len(codes2))
+    matches = positions2[codes1]
+    in_both = matches >= 0
+
+    in_first = np.zeros(ngroups, dtype=bool)
+    in_first[codes1] = True
+    return (
+        np.flatnonzero(in_both),
+        matches[in_both],
+        np.flatnonzero(~in_both),
+        np.flatnonzero(~in_first[codes2]),
+    )
+
+
+def key_columns(dataframe, join_columns, on_index=False):
+    """Get the values that a dataframe is joined on.
+
+    Parameters
+    ----------
+    dataframe : pandas ``DataFrame``
+        The dataframe
+    join_columns : list
+        The (lowercase) names of the join columns, matched to the columns of
+        ``dataframe`` regardless of case
+    on_index : bool, optional
+        If True, the index levels are the join keys instead
+
+    Returns
+    -------
+    list of array-like
+        One per join column, or one per index level
+    """
+    if on_index:
+        return [dataframe.index.get_level_values(level) for level in range(dataframe.index.nlevels)]
+    columns = dict((column.lower(), column) for column in dataframe.columns)
+    return [dataframe[columns.get(column, column)] for column in join_columns]
+
+
+def key_overlap(df1, df2, join_columns=None, on_index=False):
+    """Get the distinct join keys that are only in df1, only in df2 and in
+    both, and how many there are of each, without comparing anything else.
+
+    Only the join columns (or the index) of df1 and df2 are read, and they
+    aren't joined: see ``overlap_keys``.
+
+    Parameters
+    ----------
+    df1 : pandas ``DataFrame``
+        First dataframe to check
+    df2 : pandas ``DataFrame``
+        Second dataframe to check
+    join_columns : list or str, optional
+        Column(s) to join dataframes on, as in ``Compare``
+    on_index : bool, optional
+        If True, the index is used as the join keys
+
+    Returns
+    -------
+    dict
+        ``df1_unq_keys``, ``df2_unq_keys`` and ``intersect_keys``: the distinct
+        keys only in df1, only in df2 and in both, as a pandas ``Index`` (a
+        ``MultiIndex`` for several join columns or index levels), and
+        ``df1_unq_cnt``, ``df2_unq_cnt`` and ``intersect_cnt``: their lengths
+    """
+    if on_index and join_columns is not None:
+        raise Exception("Only provide on_index or join_columns")
+    elif isinstance(join_columns, str):
+        join_columns = [join_columns.lower()]
+    elif not on_index:
+        join_columns = [column.lower() for column in join_columns]
+
+    keys = []
+    for index, dataframe in (("df1", df1), ("df2", df2)):
+        if not isinstance(dataframe, pd.DataFrame):
+            raise TypeError("{} must be a pandas DataFrame".format(index))
+        if not on_index and not set(join_columns).issubset(
+            column.lower() for column in dataframe.columns
+        ):
+            raise ValueError("{} must have all columns from join_columns".format(index))
+        keys.append(key_columns(dataframe, join_columns, on_index))
+    if on_index and df1.index.nlevels != df2.index.nlevels:
+        raise ValueError("df1 and df2 must have the same number of index levels")
+    return overlap_keys(keys[0], keys[1], factorize_keys(keys[0]), factorize_keys(keys[1]))
+
+
+def overlap_keys(keys1, keys2, factorized1, factorized2):
+    """Get the distinct keys that are only in the first set of keys, only in
+    the second and in both.
+
+    The factorized keys are aligned onto shared codes, and the sorted unique
+    codes of each side are intersected with ``numpy.isin``; the key values
+    are then only gathered for the first row with each distinct key.
+
+    Parameters
+    ----------
+    keys1 : list of array-like
+        The key column(s) of the first dataframe
+    keys2 : list of array-like
+        The key column(s) of the second dataframe
+    factorized1 : list of tuple
+        ``keys1``, factorized by ``factorize_keys``
+    factorized2 : list of tuple
+        ``keys2``, factorized by ``factorize_keys``
+
+    Returns
+    -------
+    dict
+        See ``key_overlap``
+    """
+    codes1, codes2, _ = align_keys(factorized1, factorized2)
+    unique1, first1 = np.unique(codes1, return_index=True)
+    unique2, first2 = np.unique(codes2, return_index=True)
+    in_both = np.isin(unique1, unique2, assume_unique=True)
+    in_first = np.isin(unique2, unique1, assume_unique=True)
+
+    def keys_at(keys, positions):
+        arrays = [pd.Index(key).take(positions) for key in keys]
+        if len(arrays) == 1:
+            return arrays[0]
+        return pd.MultiIndex.from_arrays(arrays)
+
+    overlap = {
+        "df1_unq_keys": keys_at(keys1, first1[~in_both]),
+        "df2_unq_keys": keys_at(keys2, first2[~in_first]),
+        "intersect_keys": keys_at(keys1, first1[in_both]),
+    }
+    for name in ("df1_unq", "df2_unq", "intersect"):
+        overlap[name + "_cnt"] = len(overlap[name + "_keys"])
+    return overlap
+
+
+def fingerprint_column(column, key_hash):
+    """Get a fingerprint of the content of a column, aligned on its join keys.
+
+    The fingerprint is a 64-bit hash of the (key, value) pairs in the column,
+    which doesn't depend on the order of the rows.  Two columns with the same
+    dtype and the same values for the same (unique) keys have the same
+    fingerprint, so fingerprints can be stored and compared later on.
+
+    Parameters
+    ----------
+    column : Pandas.Series
+        The column to fingerprint
+    key_hash : numpy.ndarray
+        A ``uint64`` hash of the join keys of each row, e.g. from
+        ``hash_keys(factorize_keys(key_columns(df, join_columns)))``
+
+    Returns
+    -------
+    int or None
+        The fingerprint, or None for object columns holding anything but
+        strings (which can't be hashed reliably by value)
+    """
+    return fingerprint_hash(hash_column(column), key_hash)
+
+
+def fingerprint_hash(value_hash, key_hash):
+    """Combine the per-row hashes of a column's values (from ``hash_column``)
+    and of its join keys into the column's fingerprint (see
+    ``fingerprint_column``), or None if the values couldn't be hashed"""
+    if value_hash is None:
+        return None
+    row_hash = key_hash * np.uint64(0x9E3779B97F4A7C15)
+    row_hash += value_hash
+    _mix64(row_hash)
+    return int(row_hash.sum(dtype=np.uint64))
+
+
+def hash_keys(factorized):
+    """Get a 64-bit hash of the join keys of each row from the factorized
+    keys of a dataframe.  Only the unique values of each key column are
+    hashed, and their hashes are then gathered by code, so the keys
+    themselves aren't hashed again.  The hashes only depend on the key
+    values, so they're the same for any dataframe with the same keys.
+
+    Parameters
+    ----------
+    factorized : list of tuple
+        The factorized keys of the dataframe, from ``factorize_keys``
+
+    Returns
+    -------
+    numpy.ndarray
+        The ``uint64`` hash of the keys of each row
+    """
+    key_hash = None
+    for codes, uniques in factorized:
+        unique_hash = pd.util.hash_pandas_object(pd.Series(uniques), index=False).values
+        # Nulls have the last code
+        column_hash = np.append(unique_hash, np.uint64(0)).take(codes)
+        if key_hash is None:
+            key_hash = column_hash
+        else:
+            key_hash *= np.uint64(0x9E3779B97F4A7C15)
+            key_hash += column_hash
+            _mix64(key_hash)
+    return key_hash
+
+
+def hash_column(column):
+    """Get a 64-bit hash of each value in a column.  Values of the same dtype
+    have the same hash if and only if they're equal (barring collisions).
+
+    Parameters
+    ----------
+    column : Pandas.Series
+        The column to hash
+
+    Returns
+    -------
+    numpy.ndarray or None
+        The ``uint64`` hash of each value, or None for object columns holding
+        anything but strings (which can't be hashed reliably by value)
+    """
+    values = column.values
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iufmM" and values.itemsize == 8:
+        # The bits of a fixed-width value are as good as a hash of it
+        return values.view(np.uint64)
+    if values.dtype.kind == "O" and pd.api.types.infer_dtype(column, skipna=True) not in (
+        "string",
+        "empty",
+    ):
+        return None
+    # Hashing the distinct values only pays off if they repeat
+    return pd.util.hash_pandas_object(column, index=False, categorize=has_repeats(column)).values
+
+
+def _mix64(values):
+    """Scramble the bits of an array of ``uint64`` in place (the splitmix64
+    finalizer)"""
+    values ^= values >> np.uint64(30)
+    values *= np.uint64(0xBF58476D1CE4E5B9)
+    values ^= values >> np.uint64(27)
+    values *= np.uint64(0x94D049BB133111EB)
+    values ^= values >> np.uint64(31)
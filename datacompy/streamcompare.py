@@ -0,0 +1,496 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2017 Capital One Services, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare two streams of Pandas DataFrame chunks which are sorted on their join
+columns, without ever holding either of them in memory as a whole.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from datacompy.core import Compare, max_ignoring_nulls, render
+
+LOG = logging.getLogger(__name__)
+
+
+class StreamCompare(object):
+    """Comparison class for two streams of dataframe chunks, e.g. from
+    ``pd.read_csv(..., chunksize=...)``, which are both sorted (ascending) on
+    ``join_columns``.
+
+    The streams are merge-walked: each batch of rows whose keys are known to
+    be complete on both sides is compared with :class:`datacompy.Compare`,
+    its statistics are accumulated and the batch is then discarded.  Memory
+    use is bounded by a couple of chunks per side (plus the longest run of
+    duplicated keys), regardless of the length of the streams.
+
+    Parameters
+    ----------
+    df1_chunks : iterable of pandas ``DataFrame``
+        First stream of dataframe chunks to check
+    df2_chunks : iterable of pandas ``DataFrame``
+        Second stream of dataframe chunks to check
+    join_columns : list or str
+        Column(s) to join dataframes on.  Both streams must be sorted on these
+        columns, and they may not contain nulls.
+    abs_tol : float, optional
+        Absolute tolerance between two values.
+    rel_tol : float, optional
+        Relative tolerance between two values.
+    df1_name : str, optional
+        A string name for the first stream.
+    df2_name : str, optional
+        A string name for the second stream.
+    ignore_spaces : bool, optional
+        Flag to strip whitespace (including newlines) from string columns
+    sample_count : int, optional
+        The number of unique and mismatching rows to keep as samples.
+    df1_unq_handler : callable, optional
+        Called with each dataframe of rows only in df1, as they are found.
+    df2_unq_handler : callable, optional
+        Called with each dataframe of rows only in df2, as they are found.
+    ignore_case : bool, optional
+        Flag to ignore the case of string columns
+    datetime_tol : pandas.Timedelta, optional
+        Tolerance between two datetime (or timedelta) values
+
+    Attributes
+    ----------
+    column_stats : list of dict
+        The statistics for each shared column, as in ``Compare.column_stats``
+    df1_unq_rows_sample : pandas ``DataFrame``
+        The first ``sample_count`` records that are only in df1
+    df2_unq_rows_sample : pandas ``DataFrame``
+        The first ``sample_count`` records that are only in df2
+    """
+
+    def __init__(
+        self,
+        df1_chunks,
+        df2_chunks,
+        join_columns,
+        abs_tol=0,
+        rel_tol=0,
+        df1_name="df1",
+        df2_name="df2",
+        ignore_spaces=False,
+        sample_count=10,
+        df1_unq_handler=None,
+        df2_unq_handler=None,
+        ignore_case=False,
+        datetime_tol=None,
+    ):
+        if isinstance(join_columns, str):
+            self.join_columns = [join_columns.lower()]
+        else:
+            self.join_columns = [col.lower() for col in join_columns]
+
+        self.abs_tol = abs_tol
+        self.rel_tol = rel_tol
+        self.df1_name = df1_name
+        self.df2_name = df2_name
+        self.ignore_spaces = ignore_spaces
+        self.ignore_case = ignore_case
+        self.datetime_tol = datetime_tol
+        self.sample_count = sample_count
+        self._unq_handlers = {"df1": df1_unq_handler, "df2": df2_unq_handler}
+
+        self.df1_columns = self.df2_columns = None
+        self.df1_dtypes = self.df2_dtypes = None
+        self.df1_row_count = self.df2_row_count = 0
+        self.intersect_row_count = 0
+        self.df1_unq_row_count = self.df2_unq_row_count = 0
+        self.matching_row_count = 0
+        self._any_dupes = False
+        self.column_stats = []
+        self.df1_unq_rows_sample = self.df2_unq_rows_sample = None
+        self._mismatch_samples = {}
+
+        self._compare(iter(df1_chunks), iter(df2_chunks))
+
+    def _next_chunk(self, chunks, index):
+        """Read the next chunk from a stream, or return None if exhausted.
+
+        Parameters
+        ----------
+        chunks : iterator of pandas ``DataFrame``
+            The stream to read from
+        index : str
+            The "index" of the stream - df1 or df2.
+        """
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            return None
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError("{} chunks must be pandas DataFrames".format(index))
+
+        chunk = chunk.rename(columns=lambda col: col.lower(), copy=False)
+        if getattr(self, index + "_columns") is None:
+            if not set(self.join_columns).issubset(set(chunk.columns)):
+                raise ValueError("{} must have all columns from join_columns".format(index))
+            if len(set(chunk.columns)) < len(chunk.columns):
+                raise ValueError("{} must have unique column names".format(index))
+            setattr(self, index + "_columns", list(chunk.columns))
+            setattr(self, index + "_dtypes", chunk.dtypes)
+        elif list(chunk.columns) != getattr(self, index + "_columns"):
+            raise ValueError("{} chunks must all have the same columns".format(index))
+
+        if chunk[self.join_columns].isnull().values.any():
+            raise ValueError("{} must not have nulls in join_columns".format(index))
+        setattr(self, index + "_row_count", getattr(self, index + "_row_count") + len(chunk))
+        return chunk
+
+    def _compare(self, df1_chunks, df2_chunks):
+        """Merge-walk the two streams, comparing one batch of complete keys at
+        a time."""
+        streams = {"df1": df1_chunks, "df2": df2_chunks}
+        buffers = {}
+        for index in ("df1", "df2"):
+            buffers[index] = self._next_chunk(streams[index], index)
+            if buffers[index] is None:
+                raise ValueError("{} must have at least one chunk".format(index))
+        exhausted = {"df1": False, "df2": False}
+
+        while True:
+            # Keep at least one row buffered for each stream that isn't done
+            for index in ("df1", "df2"):
+                while not exhausted[index] and len(buffers[index]) == 0:
+                    self._extend(buffers, streams, exhausted, index)
+
+            last_keys = {
+                index: tuple(buffers[index][self.join_columns].iloc[-1])
+                for index in ("df1", "df2")
+                if not exhausted[index]
+            }
+            if not last_keys:
+                self._compare_batch(buffers["df1"], buffers["df2"])
+                break
+
+            # Keys before the smallest last key can't show up in later chunks
+            boundary = min(last_keys.values())
+            ready = {
+                index: self._count_before(buffers[index], boundary, index)
+                for index in ("df1", "df2")
+            }
+            if ready["df1"] == ready["df2"] == 0:
+                for index, last_key in last_keys.items():
+                    if last_key == boundary:
+                        self._extend(buffers, streams, exhausted, index)
+                continue
+
+            self._compare_batch(
+                buffers["df1"].iloc[: ready["df1"]], buffers["df2"].iloc[: ready["df2"]]
+            )
+            for index in ("df1", "df2"):
+                buffers[index] = buffers[index].iloc[ready[index] :]
+
+        self._finalize_stats()
+        LOG.info("Number of rows in df1 and not in df2: {}".format(self.df1_unq_row_count))
+        LOG.info("Number of rows in df2 and not in df1: {}".format(self.df2_unq_row_count))
+        if self.matches():
+            LOG.info("df1 matches df2")
+        else:
+            LOG.info("df1 does not match df2")
+
+    def _extend(self, buffers, streams, exhausted, index):
+        """Append the next chunk of a stream to its buffer"""
+        chunk = self._next_chunk(streams[index], index)
+        if chunk is None:
+            exhausted[index] = True
+            return
+        if len(buffers[index]) > 0 and len(chunk) > 0:
+            first_key = tuple(chunk[self.join_columns].iloc[0])
+            if first_key < tuple(buffers[index][self.join_columns].iloc[-1]):
+                raise ValueError("{} must be sorted on join_columns".format(index))
+        buffers[index] = pd.concat([buffers[index], chunk])
+
+    def _count_before(self, dataframe, boundary, index):
+        """Count the rows at the start of ``dataframe`` whose keys sort
+        strictly before ``boundary``.
+
+        Parameters
+        ----------
+        dataframe : pandas ``DataFrame``
+            A buffered part of one of the streams
+        boundary : tuple
+            The key values to compare against
+        index : str
+            The "index" of the stream - df1 or df2.
+        """
+        before = np.zeros(len(dataframe), dtype=bool)
+        equal = np.ones(len(dataframe), dtype=bool)
+        for column, value in zip(self.join_columns, boundary):
+            values = dataframe[column].values
+            before |= equal & (values < value)
+            equal &= values == value
+        count = int(before.sum())
+        if not before[:count].all():
+            raise ValueError("{} must be sorted on join_columns".format(index))
+        return count
+
+    def _compare_batch(self, df1, df2):
+        """Compare one batch of rows from each stream and accumulate the
+        results."""
+        if len(df1) == 0 and len(df2) == 0:
+            return
+        compare = Compare(
+            df1,
+            df2,
+            join_columns=self.join_columns,
+            abs_tol=self.abs_tol,
+            rel_tol=self.rel_tol,
+            ignore_spaces=self.ignore_spaces,
+            ignore_case=self.ignore_case,
+            datetime_tol=self.datetime_tol,
+        )
+        self._any_dupes = self._any_dupes or compare._any_dupes
+        self.intersect_row_count += len(compare._intersect_idx1)
+        self.matching_row_count += compare.count_matching_rows()
+
+        for index in ("df1", "df2"):
+            unq_rows = getattr(compare, index + "_unq_rows")
+            if len(unq_rows) == 0:
+                continue
+            count_name = index + "_unq_row_count"
+            setattr(self, count_name, getattr(self, count_name) + len(unq_rows))
+            if self._unq_handlers[index] is not None:
+                self._unq_handlers[index](unq_rows)
+            sample_name = index + "_unq_rows_sample"
+            setattr(self, sample_name, self._add_sample(getattr(self, sample_name), unq_rows))
+
+        if not self.column_stats:
+            self.column_stats = [dict(stats) for stats in compare.column_stats]
+            for stats in self.column_stats:
+                stats["dtype1"] = str(self.df1_dtypes[stats["column"]])
+                stats["dtype2"] = str(self.df2_dtypes[stats["column"]])
+        else:
+            batch_stats = dict((stats["column"], stats) for stats in compare.column_stats)
+            for stats in self.column_stats:
+                column_stats = batch_stats[stats["column"]]
+                for key in ("match_cnt", "unequal_cnt", "null_diff"):
+                    stats[key] += column_stats[key]
+                stats["max_diff"] = max_ignoring_nulls(stats["max_diff"], column_stats["max_diff"])
+
+        for stats in compare.column_stats:
+            if stats["unequal_cnt"] > 0:
+                column = stats["column"]
+                mismatches = np.flatnonzero(~compare._column_match(column))
+                self._mismatch_samples[column] = self._add_sample(
+                    self._mismatch_samples.get(column),
+                    compare._intersect_sample(column, mismatches[: self.sample_count]),
+                )
+
+    def _add_sample(self, sample, rows):
+        """Top up a sample with new rows, up to ``sample_count`` rows"""
+        if sample is None:
+            return rows.iloc[: self.sample_count].copy()
+        if len(sample) >= self.sample_count:
+            return sample
+        return pd.concat([sample, rows.iloc[: self.sample_count - len(sample)]])
+
+    def _finalize_stats(self):
+        """Fill in the summary fields of ``column_stats`` once all batches
+        have been compared."""
+        for stats in self.column_stats:
+            stats["all_match"] = all(
+                (stats["dtype1"] == stats["dtype2"], stats["unequal_cnt"] == 0)
+            )
+        for index in ("df1", "df2"):
+            sample_name = index + "_unq_rows_sample"
+            if getattr(self, sample_name) is None:
+                setattr(self, sample_name, pd.DataFrame(columns=getattr(self, index + "_columns")))
+
+    def df1_unq_columns(self):
+        """Get columns that are unique to df1"""
+        return set(self.df1_columns) - set(self.df2_columns)
+
+    def df2_unq_columns(self):
+        """Get columns that are unique to df2"""
+        return set(self.df2_columns) - set(self.df1_columns)
+
+    def intersect_columns(self):
+        """Get columns that are shared between the two dataframes"""
+        return set(self.df1_columns) & set(self.df2_columns)
+
+    def all_columns_match(self):
+        """Whether the columns all match in the dataframes"""
+        return self.df1_unq_columns() == self.df2_unq_columns() == set()
+
+    def all_rows_overlap(self):
+        """Whether the rows are all present in both streams"""
+        return self.df1_unq_row_count == self.df2_unq_row_count == 0
+
+    def count_matching_rows(self):
+        """Count the number of rows match (on overlapping fields)"""
+        return self.matching_row_count
+
+    def intersect_rows_match(self):
+        """Check whether the intersect rows all match"""
+        return self.matching_row_count == self.intersect_row_count
+
+    def matches(self, ignore_extra_columns=False):
+        """Return True or False if the streams match.
+
+        Parameters
+        ----------
+        ignore_extra_columns : bool
+            Ignores any columns in one stream and not in the other.
+        """
+        if not ignore_extra_columns and not self.all_columns_match():
+            return False
+        elif not self.all_rows_overlap():
+            return False
+        elif not self.intersect_rows_match():
+            return False
+        else:
+            return True
+
+    def subset(self):
+        """Return True if stream 2 is a subset of stream 1."""
+        if not self.df2_unq_columns() == set():
+            return False
+        elif not self.df2_unq_row_count == 0:
+            return False
+        elif not self.intersect_rows_match():
+            return False
+        else:
+            return True
+
+    def sample_mismatch(self, column, for_display=False):
+        """Returns the sampled rows which don't match on ``column``, with the
+        join columns and the df1 and df2 versions of the column.
+
+        Parameters
+        ----------
+        column : str
+            The raw column name (i.e. without ``_df1`` appended)
+        for_display : bool, optional
+            Whether this is just going to be used for display (overwrite the
+            column names)
+        """
+        to_return = self._mismatch_samples.get(column)
+        if to_return is None:
+            to_return = pd.DataFrame(columns=self.join_columns + [column + "_df1", column + "_df2"])
+        to_return = to_return.copy()
+        if for_display:
+            to_return.columns = self.join_columns + [
+                column + " (" + self.df1_name + ")",
+                column + " (" + self.df2_name + ")",
+            ]
+        return to_return
+
+    def report(self):
+        """Returns a string representation of a report, in the same format as
+        ``Compare.report``.  Sample rows are the first ones found rather than
+        a random sample."""
+        report = render("header.txt")
+        df_header = pd.DataFrame(
+            {
+                "DataFrame": [self.df1_name, self.df2_name],
+                "Columns": [len(self.df1_columns), len(self.df2_columns)],
+                "Rows": [self.df1_row_count, self.df2_row_count],
+            }
+        )
+        report += df_header[["DataFrame", "Columns", "Rows"]].to_string()
+        report += "\n\n"
+
+        report += render(
+            "column_summary.txt",
+            len(self.intersect_columns()),
+            len(self.df1_unq_columns()),
+            len(self.df2_unq_columns()),
+            self.df1_name,
+            self.df2_name,
+        )
+
+        report += render(
+            "row_summary.txt",
+            ", ".join(self.join_columns),
+            self.abs_tol,
+            self.rel_tol,
+            self.intersect_row_count,
+            self.df1_unq_row_count,
+            self.df2_unq_row_count,
+            self.intersect_row_count - self.matching_row_count,
+            self.matching_row_count,
+            self.df1_name,
+            self.df2_name,
+            "Yes" if self._any_dupes else "No",
+        )
+
+        report += render(
+            "column_comparison.txt",
+            len([col for col in self.column_stats if col["unequal_cnt"] > 0]),
+            len([col for col in self.column_stats if col["unequal_cnt"] == 0]),
+            sum([col["unequal_cnt"] for col in self.column_stats]),
+        )
+
+        match_stats = []
+        match_sample = []
+        for column in self.column_stats:
+            if not column["all_match"]:
+                match_stats.append(
+                    {
+                        "Column": column["column"],
+                        "{} dtype".format(self.df1_name): column["dtype1"],
+                        "{} dtype".format(self.df2_name): column["dtype2"],
+                        "# Unequal": column["unequal_cnt"],
+                        "Max Diff": column["max_diff"],
+                        "# Null Diff": column["null_diff"],
+                    }
+                )
+                if column["unequal_cnt"] > 0:
+                    match_sample.append(self.sample_mismatch(column["column"], for_display=True))
+
+        if match_stats:
+            report += "Columns with Unequal Values or Types\n"
+            report += "------------------------------------\n"
+            report += "\n"
+            df_match_stats = pd.DataFrame(match_stats)
+            df_match_stats.sort_values("Column", inplace=True)
+            report += df_match_stats[
+                [
+                    "Column",
+                    "{} dtype".format(self.df1_name),
+                    "{} dtype".format(self.df2_name),
+                    "# Unequal",
+                    "Max Diff",
+                    "# Null Diff",
+                ]
+            ].to_string()
+            report += "\n\n"
+
+            report += "Sample Rows with Unequal Values\n"
+            report += "-------------------------------\n"
+            report += "\n"
+            for sample in match_sample:
+                report += sample.to_string()
+                report += "\n\n"
+
+        for index, name in (("df1", self.df1_name), ("df2", self.df2_name)):
+            sample = getattr(self, index + "_unq_rows_sample")
+            if sample.shape[0] > 0:
+                report += "Sample Rows Only in {} (First 10 Columns)\n".format(name)
+                report += "---------------------------------------{}\n".format("-" * len(name))
+                report += "\n"
+                report += sample[sample.columns[:10]].to_string()
+                report += "\n\n"
+
+        return report
@@ -26,6 +26,7 @@ import pandas as pd
 from pandas.util.testing import assert_series_equal
 import numpy as np
 import logging
+import multiprocessing
 import sys
 
 import six
@@ -512,6 +513,18 @@ def test_index_joining_non_overlapping():
     assert list(compare.df2_unq_rows["a"]) == ["back fo mo"]
 
 
+def test_index_joining_different_levels():
+    df1 = pd.DataFrame([{"a": "hi", "b": 2}, {"a": "bye", "b": 2}]).set_index(["a", "b"])
+    df2 = pd.DataFrame([{"a": "hi", "b": 2}, {"a": "bye", "b": 2}]).set_index("a")
+    with raises(ValueError, match="index levels"):
+        datacompy.Compare(df1, df2, on_index=True)
+    compare = datacompy.Compare(df2, df2, on_index=True)
+    with raises(ValueError, match="index levels"):
+        compare.df1 = df1
+    with raises(ValueError, match="index levels"):
+        datacompy.key_overlap(df1, df2, on_index=True)
+
+
 def test_temp_column_name():
     df1 = pd.DataFrame([{"a": "hi", "b": 2}, {"a": "bye", "b": 2}])
     df2 = pd.DataFrame([{"a": "hi", "b": 2}, {"a": "bye", "b": 2}, {"a": "back fo mo", "b": 3}])
@@ -735,3 +748,971 @@ def test_calculate_max_diff(column, expected):
     assert np.isclose(
         datacompy.calculate_max_diff(MAX_DIFF_DF["base"], MAX_DIFF_DF[column]), expected
     )
+
+
+def test_calculate_max_diff_non_numeric():
+    words = pd.Series(["a", "b", "c"] * 10)
+    with mock.patch("datacompy.core.numeric_values", wraps=datacompy.numeric_values) as numbers:
+        assert datacompy.calculate_max_diff(words, pd.Series(["a", "x", "c"] * 10)) == 0
+    # Only the leading values are parsed
+    assert [len(call[0][0]) for call in numbers.call_args_list] == [8]
+    categories = pd.Series(["a", "b"], dtype="category")
+    assert datacompy.calculate_max_diff(categories, categories) == 0
+
+
+def test_array_values():
+    df1 = pd.DataFrame({"a": [0, 1, 2], "b": [np.array([1, 2]), np.array([3]), None]})
+    df2 = pd.DataFrame({"a": [0, 1, 2], "b": [np.array([1, 2]), np.array([4]), None]})
+    assert list(datacompy.columns_equal(df1["b"], df2["b"])) == [False, False, True]
+    compare = datacompy.Compare(df1, df2, "a")
+    assert not compare.matches()
+    assert compare.column_stats[1]["unequal_cnt"] == 2
+
+
+def test_factorize_keys():
+    factorized = datacompy.factorize_keys([pd.Series([2, np.nan, 1, 2])])
+    codes, uniques = factorized[0]
+    assert list(codes) == [0, 2, 1, 0]
+    assert list(uniques) == [2, 1]
+
+
+def test_align_keys():
+    codes1, codes2, ngroups = datacompy.align_keys(
+        datacompy.factorize_keys([pd.Series([1, 2, np.nan]), pd.Series(["a", "b", "c"])]),
+        datacompy.factorize_keys([pd.Series([2, np.nan, 1]), pd.Series(["b", "c", "x"])]),
+    )
+    assert codes1[1] == codes2[0]
+    assert codes1[2] == codes2[1]
+    assert codes1[0] != codes2[2]
+    assert len(set(codes1) | set(codes2)) == 4
+    assert max(codes1.max(), codes2.max()) < ngroups
+
+
+def test_join_indexers():
+    codes1 = np.array([0, 1, 2, 3])
+    codes2 = np.array([3, 4, 1])
+    both1, both2, only1, only2 = datacompy.join_indexers(codes1, codes2, 5)
+    assert list(both1) == [1, 3]
+    assert list(both2) == [2, 0]
+    assert list(only1) == [0, 2]
+    assert list(only2) == [1]
+
+
+def test_dupe_order():
+    df = pd.DataFrame([{"a": 1, "b": 3}, {"a": 2, "b": 1}, {"a": 1, "b": np.nan}, {"a": 1, "b": 2}])
+    codes = np.array([0, 1, 0, 0])
+    assert list(datacompy.dupe_order(df, codes)) == [1, 0, 2, 0]
+
+
+def test_merge_keeps_dtypes():
+    df1 = pd.DataFrame([{"a": 1, "b": 2}, {"a": 2, "b": 2}])
+    df2 = pd.DataFrame([{"a": 1, "b": 2}, {"a": 3, "b": 3}])
+    compare = datacompy.Compare(df1, df2, ["a"])
+    assert compare.df1_unq_rows["b"].dtype == np.int64
+    assert compare.df2_unq_rows["b"].dtype == np.int64
+    assert compare.intersect_rows["b_df1"].dtype == np.int64
+    assert list(compare.intersect_rows.columns) == ["a", "b_df1", "b_df2", "_merge", "b_match"]
+    assert list(compare.df2_unq_rows.index) == [2]
+
+
+def test_incompatible_join_keys():
+    df1 = pd.DataFrame([{"a": 1, "b": 2}, {"a": 2, "b": 2}])
+    df2 = pd.DataFrame([{"a": "1", "b": 2}, {"a": "2", "b": 2}])
+    with raises(ValueError, match="merge on int64 and object columns"):
+        datacompy.Compare(df1, df2, "a")
+    df2["a"] = pd.to_datetime(["2020-01-01", "2020-01-02"])
+    with raises(ValueError, match="merge on int64 and datetime64"):
+        datacompy.Compare(df1, df2, "a")
+
+
+def test_bool_and_int_join_keys_match():
+    df1 = pd.DataFrame([{"a": True, "b": 2}, {"a": False, "b": 2}])
+    df2 = pd.DataFrame([{"a": 0, "b": 2}, {"a": 1, "b": 2}])
+    compare = datacompy.Compare(df1, df2, "a")
+    assert compare.all_rows_overlap()
+    assert compare.matches()
+
+
+def test_null_join_keys_match():
+    df1 = pd.DataFrame([{"a": 1, "b": 2}, {"a": np.nan, "b": 2}])
+    df2 = pd.DataFrame([{"a": np.nan, "b": 2}, {"a": 1, "b": 2}])
+    compare = datacompy.Compare(df1, df2, ["a"])
+    assert compare.matches()
+    assert len(compare.intersect_rows) == 2
+
+
+def test_result_rows_are_lazy():
+    df1 = pd.DataFrame([{"a": 1, "b": 2}, {"a": 2, "b": 2}, {"a": 3, "b": 2}])
+    df2 = pd.DataFrame([{"a": 1, "b": 2}, {"a": 2, "b": 3}, {"a": 4, "b": 2}])
+    compare = datacompy.Compare(df1, df2, ["a"])
+    assert compare._intersect_rows is None
+    assert compare._df1_unq_rows is None
+    assert compare._df2_unq_rows is None
+    assert not compare.matches()
+    assert compare.count_matching_rows() == 1
+    compare.report()
+    assert compare._intersect_rows is None
+    assert list(compare.intersect_rows["b_match"]) == [True, False]
+    assert compare.intersect_rows is compare.intersect_rows
+    assert list(compare.df1_unq_rows["a"]) == [3]
+    assert list(compare.df2_unq_rows["a"]) == [4]
+
+
+def test_sample_mismatch():
+    df1 = pd.DataFrame([{"a": 1, "b": 2}, {"a": 2, "b": 2}, {"a": 3, "b": 2}])
+    df2 = pd.DataFrame([{"a": 1, "b": 2}, {"a": 2, "b": 3}, {"a": 3, "b": 4}])
+    compare = datacompy.Compare(df1, df2, ["a"])
+    sample = compare.sample_mismatch("b", sample_count=5)
+    assert list(sample.columns) == ["a", "b_df1", "b_df2"]
+    assert sorted(sample["a"]) == [2, 3]
+    assert sorted(sample.index) == [1, 2]
+
+
+def test_dupe_order_only_dupes():
+    df = pd.DataFrame({"a": [5, 1, 1, 2, 1], "b": [9, 3, 1, 0, 2]})
+    codes = np.array([0, 1, 1, 2, 1])
+    assert list(datacompy.dupe_order(df, codes)) == [0, 2, 0, 0, 1]
+
+
+def test_compare_not_inplace():
+    df1 = pd.DataFrame([{"A": 1, "B": 2}, {"A": 1, "B": 3}, {"A": 2, "B": 2}])
+    df2 = pd.DataFrame([{"a": 1, "b": 2}, {"a": 1, "b": 3}, {"a": 3, "b": 2}])
+    df1_before = df1.copy()
+    df2_before = df2.copy()
+    compare = datacompy.Compare(df1, df2, ["a"], inplace=False)
+    assert compare._any_dupes
+    assert not compare.matches()
+    compare.report()
+    assert list(df1.columns) == ["A", "B"]
+    assert list(compare.df1.columns) == ["a", "b"]
+    assert compare.df2 is df2
+    assert np.shares_memory(compare.df1["b"].values, df1["B"].values)
+    pd.testing.assert_frame_equal(df1, df1_before)
+    pd.testing.assert_frame_equal(df2, df2_before)
+
+
+def test_compare_not_inplace_bad():
+    df = pd.DataFrame([[1, 2], [2, 2]], columns=["a", "A"])
+    with raises(ValueError):
+        datacompy.Compare(df, df.copy(), ["a"], inplace=False)
+    assert list(df.columns) == ["a", "A"]
+
+
+def test_identical_content_fast_path():
+    df1 = pd.DataFrame({"a": [1, 2, 3], "b": [1.5, np.nan, 3.0], "c": ["x", "y", None]})
+    df2 = df1.iloc[[2, 0, 1]].copy()
+    compare = datacompy.Compare(df1, df2, ["a"])
+    assert compare._identical_content()
+    assert compare.matches()
+    assert compare.df1_fingerprints == compare.df2_fingerprints
+    assert list(compare.intersect_rows["b_match"]) == [True, True, True]
+    for stats in compare.column_stats:
+        assert stats["all_match"]
+        assert stats["null_diff"] == 0
+
+    df3 = df2.copy()
+    df3.loc[0, "b"] = 1.5000001
+    compare = datacompy.Compare(df1, df3, ["a"])
+    assert not compare._identical_content()
+    assert compare.df1_fingerprints["b"] != compare.df2_fingerprints["b"]
+    assert compare.df1_fingerprints["c"] == compare.df2_fingerprints["c"]
+    assert not compare.matches()
+
+
+def test_fingerprint_column_mixed_objects():
+    key_hash = pd.util.hash_pandas_object(pd.Series([1, 2]), index=False).values
+    assert datacompy.fingerprint_column(pd.Series([1, "2"]), key_hash) is None
+    df1 = pd.DataFrame({"a": [1, 2], "b": [1, "x"]})
+    df2 = pd.DataFrame({"a": [1, 2], "b": ["1", "x"]})
+    compare = datacompy.Compare(df1, df2, ["a"])
+    assert not compare.matches()
+
+
+def test_hash_keys():
+    keys_1 = [pd.Series([1, 2, np.nan, 2]), pd.Series(["x", "y", "z", "x"])]
+    keys_2 = [pd.Series([2, np.nan, 2]), pd.Series(["x", "z", "y"])]
+    hashes_1 = datacompy.hash_keys(datacompy.factorize_keys(keys_1))
+    hashes_2 = datacompy.hash_keys(datacompy.factorize_keys(keys_2))
+    assert list(hashes_2) == [hashes_1[3], hashes_1[2], hashes_1[1]]
+    assert len(set(hashes_1)) == 4
+
+
+def test_hash_screening_stats():
+    df1 = pd.DataFrame(
+        {
+            "a": range(6),
+            "b": [1.0, 2.0, np.nan, np.inf, 5.0, 6.0],
+            "c": ["x", "y ", None, "z", "w", "v"],
+        }
+    )
+    df2 = pd.DataFrame(
+        {
+            "a": range(6),
+            "b": [1.0, 2.5, np.nan, np.inf, np.nan, 6.0],
+            "c": ["x", "y", None, "z", "w", None],
+        }
+    )
+    compare = datacompy.Compare(df1, df2, ["a"], ignore_spaces=True)
+    stats = dict((stats["column"], stats) for stats in compare.column_stats)
+    assert stats["b"]["unequal_cnt"] == 2
+    assert stats["b"]["max_diff"] == 0.5
+    assert stats["b"]["null_diff"] == 1
+    assert stats["c"]["unequal_cnt"] == 1
+    assert stats["c"]["null_diff"] == 1
+    assert list(compare.intersect_rows["b_match"]) == [True, False, True, True, False, True]
+
+
+def test_hash_screening_skips_equal_columns():
+    df1 = pd.DataFrame({"a": range(4), "b": [1.0, np.nan, 3.0, 4.0], "c": ["w", "x", "y", "z"]})
+    df2 = df1.iloc[::-1].copy()
+    df2.loc[3, "c"] = "q"
+    with mock.patch("datacompy.core.compare_numeric_columns") as kernel:
+        compare = datacompy.Compare(df1, df2, ["a"])
+    assert not kernel.called
+    stats = dict((stats["column"], stats) for stats in compare.column_stats)
+    assert stats["b"]["all_match"] and stats["b"]["max_diff"] == 0
+    assert stats["c"]["unequal_cnt"] == 1
+    assert list(compare.intersect_rows["c_match"]) == [True, True, True, False]
+
+
+def test_hash_screening_keeps_results():
+    df1 = pd.DataFrame({"a": range(3), "s": ["1", "a", "b"], "c": pd.Categorical(["x", "y", "z"])})
+    df2 = pd.DataFrame(
+        {"a": range(3), "s": ["1.0", "a", "b"], "c": pd.Categorical(["x", "y", "q"])}
+    )
+    compare = datacompy.Compare(df1, df2, ["a"])
+    expected = datacompy.columns_equal(df1["s"], df2["s"])
+    assert list(compare.intersect_rows["s_match"]) == list(expected) == [False, True, True]
+    assert list(compare.intersect_rows["c_match"]) == [True, True, False]
+    assert compare._column_hashes == {"df1": {}, "df2": {}}
+
+
+def test_hash_column():
+    assert datacompy.hash_column(pd.Series([1, "1"])) is None
+    hashes = datacompy.hash_column(pd.Series(["a", "b", "a"]))
+    assert hashes[0] == hashes[2] != hashes[1]
+
+
+@pytest.mark.parametrize("n_jobs", [None, 1, 3, -1, -2])
+def test_n_jobs(n_jobs):
+    df1 = pd.DataFrame(np.random.randint(0, 5, size=(200, 10)), columns=list("abcdefghij"))
+    df2 = df1.copy()
+    df2["c"] = df2["c"] + 1
+    df2["h"] = df2["h"].astype(float)
+    compare = datacompy.Compare(df1, df2, ["a"], n_jobs=n_jobs)
+    assert [stats["column"] for stats in compare.column_stats] == list("abcdefghij")
+    unequal = [stats["column"] for stats in compare.column_stats if not stats["all_match"]]
+    assert unequal == ["c", "h"]
+    assert compare.count_matching_rows() == 0
+
+
+def test_n_jobs_zero():
+    df = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+    with raises(ValueError, match="n_jobs"):
+        datacompy.Compare(df, df.copy(), ["a"], n_jobs=0)
+
+
+def test_partition_positions():
+    partitions = np.array([1, 0, 2, 1, 0])
+    result = datacompy.partition_positions(partitions, 4)
+    assert [list(positions) for positions in result] == [[1, 4], [0, 3], [2], []]
+
+
+@pytest.mark.parametrize("on_index", [False, True])
+def test_n_partitions(on_index):
+    np.random.seed(0)
+    df1 = pd.DataFrame(
+        {
+            "k": np.random.randint(0, 300, 500),
+            "a": np.random.rand(500),
+            "b": np.random.choice(["x", "y", None], 500),
+            "c": pd.date_range("2018-01-01", periods=500, tz="UTC"),
+        }
+    )
+    df2 = df1.sample(frac=0.9, random_state=1)
+    df2["k"] = df2["k"] + (np.random.rand(len(df2)) < 0.05)
+    df2.loc[df2.index[:20], "a"] += 1
+    if on_index:
+        kwargs = {"on_index": True}
+    else:
+        kwargs = {"join_columns": "k"}
+    expected = datacompy.Compare(df1, df2, **kwargs)
+    compare = datacompy.Compare(df1, df2, n_partitions=3, **kwargs)
+    assert compare.column_stats == expected.column_stats
+    pd.testing.assert_frame_equal(compare.intersect_rows, expected.intersect_rows)
+    pd.testing.assert_frame_equal(compare.df1_unq_rows, expected.df1_unq_rows)
+    pd.testing.assert_frame_equal(compare.df2_unq_rows, expected.df2_unq_rows)
+    assert compare.count_matching_rows() == expected.count_matching_rows()
+
+
+def test_n_partitions_null_max_diff():
+    df1 = pd.DataFrame({"k": range(6), "a": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]})
+    df2 = pd.DataFrame({"k": [0, 1], "a": [np.nan, np.nan]})
+    expected = datacompy.Compare(df1, df2, "k")
+    compare = datacompy.Compare(df1, df2, "k", n_partitions=3)
+    assert np.isnan(expected.column_stats[1]["max_diff"])
+    assert np.isnan(compare.column_stats[1]["max_diff"])
+
+
+def object_check(dtype_1, dtype_2):
+    return dtype_1 == dtype_2 == object
+
+
+def lower_equal(col_1, col_2, rel_tol, abs_tol, ignore_spaces, ignore_case, datetime_tol):
+    return col_1.str.lower().values == col_2.str.lower().values
+
+
+@pytest.mark.skipif(sys.version_info < (3, 4), reason="needs multiprocessing.get_context")
+@mock.patch("datacompy.core._registered_comparators", [])
+def test_n_partitions_registered_comparator():
+    df1 = pd.DataFrame({"a": range(4), "b": ["x", "Y", "z", "W"]})
+    df2 = pd.DataFrame({"a": range(4), "b": ["X", "y", "z", "w"]})
+    datacompy.register_comparator(object_check, lower_equal)
+    with mock.patch("datacompy.core.Pool", multiprocessing.get_context("spawn").Pool):
+        compare = datacompy.Compare(df1, df2, "a", n_partitions=2)
+    assert compare.matches()
+
+
+@pytest.mark.parametrize(
+    "column,kind",
+    [
+        (pd.Series([1, 2]), "numeric"),
+        (pd.Series([1.5, np.nan]), "numeric"),
+        (pd.Series([True, False]), "bool"),
+        (pd.Series([True, None]), "bool"),
+        (pd.Series([Decimal("1"), None]), "decimal"),
+        (pd.Series([1, 2.5, None], dtype=object), "numeric"),
+        (pd.Series(["a", None]), "string"),
+        (pd.Series([None, None], dtype=object), "string"),
+        (pd.Series(["a", 1]), "object"),
+        (pd.Series(pd.to_datetime(["2017-01-01"])), "datetime"),
+        (pd.Series(pd.to_datetime(["2017-01-01"])).dt.tz_localize("UTC"), "datetime"),
+        (pd.Series(pd.to_timedelta([1], unit="s")), "timedelta"),
+        (pd.Series(pd.Categorical(["a"])), "category"),
+    ],
+)
+def test_column_kind(column, kind):
+    assert datacompy.column_kind(column) == kind
+
+
+def test_get_comparator():
+    numbers = pd.Series([1.0])
+    strings = pd.Series(["a"])
+    dates = pd.Series(pd.to_datetime(["2017-01-01"]))
+    assert datacompy.get_comparator(numbers, pd.Series([Decimal("1")])) is datacompy.compare_numeric
+    assert datacompy.get_comparator(dates, dates) is datacompy.compare_datetimes
+    assert datacompy.get_comparator(strings, dates) is datacompy.compare_strings_and_dates
+    assert datacompy.get_comparator(strings, strings) is datacompy.compare_strings
+    assert datacompy.get_comparator(strings, pd.Series(["a", 1])) is datacompy.compare_objects
+    assert datacompy.get_comparator(numbers, strings) is datacompy.compare_objects
+
+
+def test_numeric_strings_equal():
+    df = pd.DataFrame(
+        [
+            {"a": "1", "b": "1.0", "c": 1.0, "expected": True},
+            {"a": "2.5", "b": "2.5", "c": 2.5, "expected": True},
+            {"a": "3", "b": "3.1", "c": 3.1, "expected": False},
+            {"a": None, "b": None, "c": np.nan, "expected": True},
+        ]
+    )
+    assert_series_equal(datacompy.columns_equal(df.a, df.b), df.expected, check_names=False)
+    assert_series_equal(datacompy.columns_equal(df.a, df.c), df.expected, check_names=False)
+    df.loc[3, "b"] = "three"
+    assert not datacompy.columns_equal(df.a, df.b)[0]
+
+
+def test_datetime_columns_tz_mismatch():
+    naive = pd.Series(pd.to_datetime(["2017-01-01", None]))
+    aware = naive.dt.tz_localize("UTC")
+    assert datacompy.columns_equal(aware, aware.dt.tz_convert("US/Eastern")).all()
+    assert list(datacompy.columns_equal(naive, aware)) == [False, True]
+
+
+@mock.patch("datacompy.core._registered_comparators", [])
+def test_register_comparator():
+    def lower_equal(col_1, col_2, rel_tol, abs_tol, ignore_spaces, ignore_case, datetime_tol):
+        return col_1.str.lower().values == col_2.str.lower().values
+
+    df1 = pd.DataFrame({"a": [1, 2], "b": ["x", "Y"]})
+    df2 = pd.DataFrame({"a": [1, 2], "b": ["X", "y"]})
+    assert not datacompy.Compare(df1, df2, "a").matches()
+    datacompy.register_comparator(
+        lambda dtype_1, dtype_2: dtype_1 == dtype_2 == object, lower_equal
+    )
+    assert datacompy.get_comparator(df1.b, df2.b) is lower_equal
+    assert datacompy.get_comparator(df1.a, df2.a) is datacompy.compare_numeric
+    assert datacompy.Compare(df1, df2, "a").matches()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_compare_numeric_columns(chunk_size):
+    col_1 = pd.Series([1.0, 2.0, np.nan, np.inf, -np.inf, np.nan, 5.0, 7.0])
+    col_2 = pd.Series([1, 2.05, np.nan, np.inf, np.inf, 3.0, np.inf, 7.5])
+    match, max_diff, null_diff = datacompy.compare_numeric_columns(
+        col_1.values, col_2.values, abs_tol=0.1, chunk_size=chunk_size
+    )
+    assert list(match) == list(datacompy.columns_equal(col_1, col_2, abs_tol=0.1))
+    assert list(match) == [True, True, True, True, False, False, False, False]
+    assert max_diff == datacompy.calculate_max_diff(col_1, col_2) == np.inf
+    assert null_diff == 1
+
+    match, max_diff, null_diff = datacompy.compare_numeric_columns(
+        np.array([1, 2, 3]), np.array([True, True, False]), chunk_size=chunk_size
+    )
+    assert list(match) == [True, False, False]
+    assert max_diff == 3
+    assert null_diff == 0
+
+
+def test_compare_numeric_columns_empty():
+    match, max_diff, null_diff = datacompy.compare_numeric_columns(np.array([]), np.array([]))
+    assert len(match) == 0
+    assert np.isnan(max_diff)
+    assert null_diff == 0
+
+
+def test_compare_numeric_columns_scratch():
+    scratch = datacompy.ScratchBuffers(chunk_size=4)
+    col_1 = np.array([1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, np.inf])
+    col_2 = np.array([1, 2, 3, 4, 5, 6, 7, 8, 10, 11])
+    expected = datacompy.compare_numeric_columns(col_1, col_2, abs_tol=0.5)
+    for _ in range(2):
+        match, max_diff, null_diff = datacompy.compare_numeric_columns(
+            col_1, col_2, abs_tol=0.5, scratch=scratch
+        )
+        assert list(match) == list(expected[0])
+        assert max_diff == expected[1] == np.inf
+        assert null_diff == expected[2] == 1
+    match, _, _ = datacompy.compare_numeric_columns(col_2[:3], col_2[:3], scratch=scratch)
+    assert match.all()
+
+
+def test_string_columns_equal_with_ignore_case():
+    col_1 = pd.Series([u"Hi", u"Yo", u"Hey", u"r\xe9sum\xe9", u"datacompy", u"something", None])
+    col_2 = pd.Series([u"hi", u"YO", u"Hey ", u"R\xc9SUM\xc9", u"DataComPy", None, None])
+    actual_out = datacompy.columns_equal(col_1, col_2, ignore_case=True)
+    expect_out = pd.Series([True, True, False, True, True, False, True])
+    assert_series_equal(expect_out, actual_out, check_names=False)
+    actual_out = datacompy.columns_equal(col_1, col_2, ignore_spaces=True, ignore_case=True)
+    expect_out = pd.Series([True, True, True, True, True, False, True])
+    assert_series_equal(expect_out, actual_out, check_names=False)
+
+
+def test_compare_strings_shared_dictionary():
+    col_1 = pd.Series([" a", "B", None, "c", "1"] * 100)
+    col_2 = pd.Series(["a", "b ", None, "C", "1"] * 100)
+    expected = [True, False, True, False, True] * 100
+    match = datacompy.compare_strings(col_1, col_2, 0, 0, True, False)
+    assert list(match) == expected
+    assert list(match) == list(datacompy.compare_objects(col_1, col_2, 0, 0, True, False))
+    assert datacompy.compare_strings(col_1, col_2, 0, 0, True, True).all()
+
+    numbers_1 = pd.Series(["1", " 2.5", None] * 100)
+    numbers_2 = pd.Series(["1.0", "2.50 ", None] * 100)
+    assert datacompy.compare_strings(numbers_1, numbers_2, 0, 0, True, False).all()
+
+
+def test_compare_ignore_case():
+    df1 = pd.DataFrame([{"a": 1, "b": "Hi"}, {"a": 2, "b": "yo"}])
+    df2 = pd.DataFrame([{"a": 1, "b": "hi"}, {"a": 2, "b": "YO"}])
+    assert not datacompy.Compare(df1, df2, "a").matches()
+    assert datacompy.Compare(df1, df2, "a", ignore_case=True).matches()
+
+
+def test_parse_dates():
+    strings = np.array(["2017-01-01", "2017-01-02"], dtype=object)
+    assert list(datacompy.parse_dates(strings)) == list(pd.to_datetime(strings))
+    # Strings which don't all match the format of the first one
+    strings = np.array(["2017-01-01", "01/02/2017 10:00"], dtype=object)
+    assert list(datacompy.parse_dates(strings)) == list(pd.to_datetime(strings))
+    with raises(ValueError):
+        datacompy.parse_dates(np.array(["2017-01-01", "217-01-01"], dtype=object))
+
+
+def test_string_and_date_columns_repeated_values():
+    strings = pd.Series(["2017-01-01", "2017-01-02", None, "2017-01-01", "2017-01-02"] * 3)
+    dates = pd.Series(pd.to_datetime(["2017-01-01", "2017-01-03", None, None, "2017-01-02"] * 3))
+    expected = [True, False, True, False, True] * 3
+    assert list(datacompy.compare_string_and_date_columns(strings, dates)) == expected
+    assert list(datacompy.compare_string_and_date_columns(dates, strings)) == expected
+    aware = dates.dt.tz_localize("UTC")
+    expected = [False, False, True, False, False] * 3
+    assert list(datacompy.compare_string_and_date_columns(strings, aware)) == expected
+    offsets = pd.Series(["2017-01-01T00:00:00+00:00", "2017-01-02T00:00:00+00:00"])
+    assert datacompy.compare_string_and_date_columns(offsets, aware[:2].reset_index(drop=True))[0]
+    with mock.patch("datacompy.core.parse_dates", side_effect=KeyboardInterrupt):
+        with raises(KeyboardInterrupt):
+            datacompy.compare_string_and_date_columns(strings, dates)
+
+
+def test_nan_strings_compare_as_numbers():
+    col_1 = pd.Series(["1", "nan", "2.5"])
+    col_2 = pd.Series(["1.0", "NaN", "2.5"])
+    assert list(datacompy.columns_equal(col_1, col_2)) == [True, True, True]
+    # Unless the columns don't only hold numbers
+    col_1[2] = col_2[2] = "x"
+    assert list(datacompy.columns_equal(col_1, col_2)) == [False, False, True]
+
+
+def needs_dtype(name):
+    """Skip a test on pandas versions without the ``name`` extension dtype"""
+    return pytest.mark.skipif(not hasattr(pd, name), reason="pandas has no {}".format(name))
+
+
+@pytest.mark.parametrize(
+    "dtype,values_1,values_2,expected",
+    [
+        pytest.param(
+            "Int64",
+            [1, 2, None, 4],
+            [1, 3, None, None],
+            [True, False, True, False],
+            marks=needs_dtype("Int64Dtype"),
+        ),
+        pytest.param(
+            "Float64",
+            [1.0, 2.0, None],
+            [1.0, 2.05, None],
+            [True, True, True],
+            marks=needs_dtype("Float64Dtype"),
+        ),
+        pytest.param(
+            "boolean",
+            [True, False, None],
+            [True, True, None],
+            [True, False, True],
+            marks=needs_dtype("BooleanDtype"),
+        ),
+        pytest.param(
+            "string",
+            ["a", " b", None, "c"],
+            ["a", "B", None, None],
+            [True, True, True, False],
+            marks=needs_dtype("StringDtype"),
+        ),
+    ],
+)
+def test_nullable_extension_columns(dtype, values_1, values_2, expected):
+    col_1 = pd.Series(values_1, dtype=dtype)
+    col_2 = pd.Series(values_2, dtype=dtype)
+    actual = datacompy.columns_equal(
+        col_1, col_2, abs_tol=0.1, ignore_spaces=True, ignore_case=True
+    )
+    assert list(actual) == expected
+    compare = datacompy.Compare(
+        pd.DataFrame({"a": col_1, "k": range(len(col_1))}),
+        pd.DataFrame({"a": col_2, "k": range(len(col_2))}),
+        "k",
+        abs_tol=0.1,
+        ignore_spaces=True,
+        ignore_case=True,
+    )
+    stats = [stats for stats in compare.column_stats if stats["column"] == "a"][0]
+    assert stats["match_cnt"] == sum(expected)
+    assert stats["null_diff"] == (col_1.isnull() ^ col_2.isnull()).sum()
+
+
+@needs_dtype("StringDtype")
+def test_nullable_extension_against_numpy_columns():
+    assert list(
+        datacompy.columns_equal(pd.Series([1, None], dtype="Int64"), pd.Series([1.0, np.nan]))
+    ) == [True, True]
+    assert list(
+        datacompy.columns_equal(pd.Series(["a", None], dtype="string"), pd.Series(["a", None]))
+    ) == [True, True]
+    numbers = pd.Series(["1", "2.5", None], dtype="string")
+    assert datacompy.columns_equal(numbers, pd.Series(["1.0", "2.5", None], dtype="string")).all()
+
+
+def test_arrow_columns():
+    pa = pytest.importorskip("pyarrow")
+    if not hasattr(pd, "ArrowDtype"):
+        pytest.skip("pandas has no ArrowDtype")
+
+    def arrow(values, dtype):
+        return pd.Series(pd.arrays.ArrowExtensionArray(pa.array(values, dtype)))
+
+    numbers = arrow([1, 2, None, 4], pa.int64())
+    assert list(datacompy.columns_equal(numbers, arrow([1, 3, None, None], pa.int64()))) == [
+        True,
+        False,
+        True,
+        False,
+    ]
+    strings = arrow([" A", "b", None], pa.string())
+    assert datacompy.columns_equal(
+        strings, arrow(["a", "b", None], pa.string()), ignore_spaces=True, ignore_case=True
+    ).all()
+    # Arrow-backed strings against python-backed ones
+    for other in (
+        pd.Series([" A", "c", None], dtype="string"),
+        pd.Series([" A", "c", None], dtype="string[pyarrow]"),
+        pd.Series([" A", "c", None], dtype=object),
+    ):
+        assert list(datacompy.columns_equal(strings, other)) == [True, False, True]
+        assert list(datacompy.columns_equal(other, strings)) == [True, False, True]
+    mixed = datacompy.columns_equal(
+        pd.Series([" A", None], dtype="string[pyarrow]"),
+        pd.Series(["a", None], dtype="string"),
+        ignore_spaces=True,
+        ignore_case=True,
+    )
+    assert list(mixed) == [True, True]
+    big = arrow([2 ** 60, None], pa.int64())
+    assert list(datacompy.columns_equal(big, pd.Series([2.0 ** 60, np.nan]))) == [True, True]
+    bigger = arrow([2 ** 60 + 1, None], pa.int64())
+    assert list(datacompy.columns_equal(big, bigger)) == [False, True]
+    assert datacompy.calculate_max_diff(big, bigger) == 1
+    dates = arrow([pd.Timestamp("2017-01-01").to_pydatetime(), None], pa.timestamp("ns", tz="UTC"))
+    assert datacompy.column_kind(dates) == "datetime"
+    assert datacompy.columns_equal(dates, pd.Series(["2017-01-01T00:00:00+00:00", None])).all()
+    compare = datacompy.Compare(
+        pd.DataFrame({"a": numbers, "k": range(4)}),
+        pd.DataFrame({"a": numbers, "k": range(4)}),
+        "k",
+    )
+    assert compare.matches()
+
+
+def test_decimal_columns_compared_exactly():
+    pytest.importorskip("pyarrow")
+    col_1 = pd.Series([Decimal("1.5"), Decimal("0.1000000000000000001"), None, np.nan])
+    col_2 = pd.Series([Decimal("1.50"), Decimal("0.1"), np.nan, Decimal("2")])
+    assert datacompy.decimal_arrays(col_1, col_2) is not None
+    assert list(datacompy.columns_equal(col_1, col_2)) == [True, False, True, False]
+    assert list(datacompy.columns_equal(col_1, col_2, abs_tol=0.001)) == [True, True, True, False]
+    assert datacompy.calculate_max_diff(col_1, col_2) == 1e-19
+
+
+def test_compare_decimal_columns():
+    pytest.importorskip("pyarrow")
+    col_1 = pd.Series([Decimal("1.25"), Decimal("3"), None, Decimal("-1")])
+    col_2 = pd.Series([Decimal("1.25"), Decimal("3.5"), Decimal("4"), Decimal("-1.01")])
+    match, max_diff, null_diff = datacompy.compare_decimal_columns(
+        *datacompy.decimal_arrays(col_1, col_2), rel_tol=0.01
+    )
+    assert list(match) == [True, False, False, True]
+    assert max_diff == 0.5
+    assert null_diff == 1
+
+
+def test_decimal_arrays_fallback():
+    pytest.importorskip("pyarrow")
+    decimals = pd.Series([Decimal("1")])
+    assert datacompy.decimal_arrays(decimals, pd.Series([1.0])) is None
+    assert datacompy.decimal_arrays(decimals, pd.Series(["1"])) is None
+    # A value with more decimal places than the leading ones
+    longer = pd.Series([Decimal("1")] * datacompy.DECIMAL_SAMPLE_SIZE + [Decimal("1.5")])
+    assert datacompy.decimal_arrays(longer, longer) is None
+    assert list(datacompy.columns_equal(longer, longer.astype(float))) == [True] * len(longer)
+    infinite = pd.Series([Decimal("1.5"), Decimal("Infinity"), Decimal("-Infinity")])
+    assert datacompy.decimal_arrays(infinite, infinite) is None
+    assert list(datacompy.columns_equal(infinite, infinite)) == [True, True, True]
+    swapped = pd.Series([Decimal("1.5"), Decimal("-Infinity"), Decimal("Infinity")])
+    assert list(datacompy.columns_equal(infinite, swapped)) == [True, False, False]
+
+
+def test_categorical_columns_equal():
+    col_1 = pd.Series(pd.Categorical(["a", "B ", None, "c", "d"], categories=["d", "c", "B ", "a"]))
+    col_2 = pd.Series(pd.Categorical(["a", "b", None, None, "x"]))
+    assert list(datacompy.columns_equal(col_1, col_2)) == [True, False, True, False, False]
+    assert list(datacompy.columns_equal(col_1, col_2, ignore_spaces=True, ignore_case=True)) == [
+        True,
+        True,
+        True,
+        False,
+        False,
+    ]
+    numbers_1 = pd.Series(pd.Categorical([1.0, 2.0, None]))
+    numbers_2 = pd.Series(pd.Categorical([1.001, 2.5, None]))
+    assert list(datacompy.columns_equal(numbers_1, numbers_2)) == [False, False, True]
+    assert list(datacompy.columns_equal(numbers_1, numbers_2, abs_tol=0.01)) == [True, False, True]
+
+
+def test_categorical_columns_not_materialized():
+    col_1 = pd.Series(pd.Categorical(["a", "b", "c"] * 3))
+    col_2 = pd.Series(pd.Categorical(["a", "b", "d"] * 3, categories=["d", "b", "a"]))
+    with mock.patch("datacompy.core.compare_values") as compare_values:
+        match = datacompy.columns_equal(col_1, col_2)
+    assert not compare_values.called
+    assert list(match) == [True, True, False] * 3
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_compare_integer_columns(chunk_size):
+    big = 2 ** 53
+    values_1 = np.array([big, big + 1, -5, np.iinfo(np.int64).min, 7])
+    values_2 = np.array([big + 1, big + 1, 5, np.iinfo(np.int64).max, 7])
+    match, max_diff, null_diff = datacompy.compare_integer_columns(
+        values_1, values_2, chunk_size=chunk_size
+    )
+    assert list(match) == [False, True, False, False, True]
+    assert max_diff == 2 ** 64 - 1
+    assert null_diff == 0
+    match, _, _ = datacompy.compare_integer_columns(
+        values_1, values_2, abs_tol=9.9, chunk_size=chunk_size
+    )
+    assert list(match) == [True, True, False, False, True]
+    match, _, _ = datacompy.compare_integer_columns(
+        values_1, values_2, rel_tol=0.5, chunk_size=chunk_size
+    )
+    assert list(match) == [True, True, False, False, True]
+
+
+def test_compare_integer_columns_nulls():
+    values_1 = np.array([1, 2, 3, 4, 10])
+    values_2 = np.array([1, 9, 3, 5, 0])
+    null_1 = np.array([False, True, True, False, False])
+    null_2 = np.array([False, True, False, True, False])
+    match, max_diff, null_diff = datacompy.compare_integer_columns(
+        values_1, values_2, chunk_size=2, null_1=null_1, null_2=null_2
+    )
+    assert list(match) == [True, True, False, False, False]
+    assert max_diff == 10
+    assert null_diff == 2
+    match, max_diff, null_diff = datacompy.compare_integer_columns(
+        values_1[1:2], values_2[1:2], null_1=null_1[1:2]
+    )
+    assert list(match) == [False]
+    assert np.isnan(max_diff)
+    assert null_diff == 1
+
+
+@needs_dtype("Int64Dtype")
+def test_nullable_integer_columns_equal_exactly():
+    col_1 = pd.Series([2 ** 60, 2 ** 60 + 1, None, 3], dtype="Int64")
+    col_2 = pd.Series([2 ** 60 + 1, 2 ** 60 + 1, None, None], dtype="Int64")
+    assert list(datacompy.columns_equal(col_1, col_2)) == [False, True, True, False]
+    assert datacompy.calculate_max_diff(col_1, col_2) == 1
+    compare = datacompy.Compare(
+        pd.DataFrame({"id": col_1, "k": range(4)}), pd.DataFrame({"id": col_2, "k": range(4)}), "k"
+    )
+    assert not compare.matches()
+    stats = [stats for stats in compare.column_stats if stats["column"] == "id"][0]
+    assert (stats["match_cnt"], stats["max_diff"], stats["null_diff"]) == (2, 1, 1)
+
+
+def test_integer_columns_equal_exactly():
+    col_1 = pd.Series([2 ** 60, 2 ** 60 + 1, 3])
+    col_2 = pd.Series([2 ** 60 + 1, 2 ** 60 + 1, 3])
+    assert list(datacompy.columns_equal(col_1, col_2)) == [False, True, True]
+    assert datacompy.calculate_max_diff(col_1, col_2) == 1
+    assert datacompy.numeric_kernel(col_1.values, col_2.values) is datacompy.compare_integer_columns
+    unsigned = col_2.values.astype(np.uint64)
+    assert datacompy.numeric_kernel(col_1.values, unsigned) is datacompy.compare_numeric_columns
+    floats = col_2.values.astype(float)
+    assert datacompy.numeric_kernel(col_1.values, floats) is datacompy.compare_numeric_columns
+    compare = datacompy.Compare(
+        pd.DataFrame({"id": col_1, "k": range(3)}), pd.DataFrame({"id": col_2, "k": range(3)}), "k"
+    )
+    stats = [stats for stats in compare.column_stats if stats["column"] == "id"][0]
+    assert stats["match_cnt"] == 2
+    assert stats["max_diff"] == 1
+
+
+def test_compare_datetime_columns():
+    values_1 = pd.to_datetime(
+        ["2017-01-01", "2017-01-01 00:00:01", None, "2017-01-02", None]
+    ).values
+    values_2 = pd.to_datetime(
+        ["2017-01-01 00:00:00.5", "2017-01-01 00:00:03", None, None, "2017-01-02"]
+    ).values
+    match, max_diff, null_diff = datacompy.compare_datetime_columns(values_1, values_2)
+    assert list(match) == [False, False, True, False, False]
+    assert max_diff == pd.Timedelta("2s")
+    assert null_diff == 2
+    match, _, _ = datacompy.compare_datetime_columns(values_1, values_2, "1s")
+    assert list(match) == [True, False, True, False, False]
+    _, max_diff, _ = datacompy.compare_datetime_columns(values_1[2:3], values_2[2:3])
+    assert max_diff is pd.NaT
+
+
+def test_datetime_tol():
+    dates_1 = pd.Series(pd.to_datetime(["2017-01-01", "2017-01-01 00:00:01", None]))
+    dates_2 = pd.Series(pd.to_datetime(["2017-01-01 00:00:00.5", "2017-01-01 00:00:03", None]))
+    expected = [True, False, True]
+    assert list(datacompy.columns_equal(dates_1, dates_2, datetime_tol="1s")) == expected
+    assert datacompy.calculate_max_diff(dates_1, dates_2) == pd.Timedelta("2s")
+    deltas_1, deltas_2 = dates_1 - dates_1[0], dates_2 - dates_1[0]
+    assert datacompy.get_comparator(deltas_1, deltas_2) is datacompy.compare_datetimes
+    assert list(datacompy.columns_equal(deltas_1, deltas_2, datetime_tol="1s")) == expected
+    strings = pd.Series(["2017-01-01 00:00:00.2", "2017-01-01", None])
+    assert list(datacompy.columns_equal(strings, dates_1, datetime_tol="1s")) == [True, True, True]
+
+    compare = datacompy.Compare(
+        pd.DataFrame({"k": range(3), "dates": dates_1, "deltas": deltas_1}),
+        pd.DataFrame({"k": range(3), "dates": dates_2, "deltas": deltas_2}),
+        "k",
+        datetime_tol=pd.Timedelta("1s"),
+    )
+    stats = dict((stats["column"], stats) for stats in compare.column_stats)
+    for stats in (stats["dates"], stats["deltas"]):
+        assert stats["match_cnt"] == 2
+        assert stats["max_diff"] == pd.Timedelta("2s")
+        assert stats["null_diff"] == 0
+
+
+def test_match_matrix():
+    df1 = pd.DataFrame(np.arange(12).reshape(4, 3), columns=["a", "b", "c"])
+    df1["k"] = range(4)
+    df2 = df1.copy()
+    df2.loc[1, "b"] = -1
+    df2.loc[3, "c"] = -1
+    compare = datacompy.Compare(df1, df2, "k")
+    assert compare._match_matrix.shape == (4, 3)
+    assert compare._match_matrix.flags.f_contiguous
+    assert list(compare._column_match("b")) == [True, False, True, True]
+    assert compare.count_matching_rows() == 2
+    assert not compare.intersect_rows_match()
+    assert list(compare.intersect_rows.columns[-3:]) == ["a_match", "b_match", "c_match"]
+    assert list(compare.intersect_rows["c_match"]) == [True, True, True, False]
+
+
+def test_derived_results_memoized():
+    df1 = pd.DataFrame({"a": [1, 2, 3], "b": [1, 2, 3], "c": [1, 1, 1]})
+    df2 = pd.DataFrame({"a": [1, 2, 3], "b": [1, 2, 4], "d": [1, 1, 1]})
+    compare = datacompy.Compare(df1, df2, "a")
+    compare.report()
+    assert not compare.intersect_rows_match()
+    assert compare.count_matching_rows() == 2
+    for name in ("count_matching_rows", "intersect_rows_match", "intersect_columns"):
+        assert name in compare._derived
+    # Callers can't change the memoized sets
+    compare.intersect_columns().add("x")
+    assert compare.intersect_columns() == {"a", "b"}
+    with mock.patch.object(compare, "_match_matrix", None):
+        assert compare.count_matching_rows() == 2
+
+    compare.df2 = df2.rename(columns={"d": "c"})
+    assert compare.intersect_columns() == {"a", "b", "c"}
+    assert set(stats["column"] for stats in compare.column_stats) == {"a", "b", "c"}
+    assert compare.count_matching_rows() == 2
+
+
+def test_compare_df_reassigned():
+    df1 = pd.DataFrame({"a": [1, 2, 3, 4], "b": [1.0, 2.0, 3.0, 4.0]})
+    df2 = pd.DataFrame({"a": [1, 2, 3, 4], "b": [1.0, 2.0, 3.0, 5.0]})
+    compare = datacompy.Compare(df1, df2, "a")
+    assert compare.count_matching_rows() == 3
+    compare.df2 = pd.DataFrame({"a": [2, 5], "b": [2.0, 5.0]})
+    assert "Number of rows in df2 but not in df1: 1" in compare.report()
+    assert list(compare.df1_unq_rows["a"]) == [1, 3, 4]
+    assert list(compare.df2_unq_rows["a"]) == [5]
+    assert list(compare.intersect_rows["a"]) == [2]
+    assert compare.count_matching_rows() == 1
+    compare.df1 = pd.DataFrame({"a": [2, 2], "b": [2.0, 3.0]})
+    assert compare._any_dupes
+    compare.df1 = df1
+    assert not compare._any_dupes
+    assert compare.matches(ignore_extra_columns=True) is False
+    assert compare.count_matching_rows() == 1
+
+
+def test_stats_only():
+    df1 = pd.DataFrame({"a": np.arange(100), "b": np.arange(100.0), "c": 1})
+    df2 = pd.DataFrame({"a": np.arange(20, 130), "b": np.arange(20.0, 130.0), "c": 1})
+    df2.loc[df2.a % 2 == 0, "b"] += 0.5
+    full = datacompy.Compare(df1, df2, "a")
+    compare = datacompy.Compare(df1, df2, "a", stats_only=True, sample_count=5)
+    assert compare.df1 is None and compare.df2 is None
+    assert compare._match_matrix is None and compare._df1_unq_idx is None
+    assert compare.column_stats == full.column_stats
+    assert compare.count_matching_rows() == full.count_matching_rows() == 40
+    assert not compare.matches()
+    assert compare.all_columns_match()
+    assert not compare.all_rows_overlap()
+    assert compare.intersect_columns() == {"a", "b", "c"}
+    mismatch = compare.sample_mismatch("b", sample_count=10)
+    assert len(mismatch) == 5
+    assert (mismatch.b_df1 != mismatch.b_df2).all()
+    assert compare.sample_mismatch("c").empty
+    assert len(compare._unq_rows_sample("df1", 10)) == 5
+    assert len(compare._unq_rows_sample("df2", 3)) == 3
+    report = compare.report()
+    assert "Number of rows in df1 but not in df2: 20" in report
+    assert "Sample Rows Only in df2 (First 10 Columns)" in report
+    for rows in ("df1_unq_rows", "df2_unq_rows", "intersect_rows"):
+        with raises(ValueError, match="stats_only"):
+            getattr(compare, rows)
+    with raises(ValueError, match="stats_only"):
+        compare.df1 = df1
+
+
+def test_lazy():
+    df1 = pd.DataFrame({"a": [1, 2, 3, 4], "b": [1.0, 2.0, 3.0, 4.0], "c": 1})
+    df2 = pd.DataFrame({"a": [2, 3, 4, 5], "b": [2.0, 3.5, 4.0, 5.0], "d": 1})
+    eager = datacompy.Compare(df1, df2, "a")
+    compare = datacompy.Compare(df1, df2, "a", lazy=True)
+    assert compare._phases == set()
+    assert not compare.all_columns_match()
+    assert compare.intersect_columns() == {"a", "b"}
+    assert compare._phases == set()
+    assert not compare.all_rows_overlap()
+    assert compare.df1_unq_rows.equals(eager.df1_unq_rows)
+    assert compare._phases == {"join"}
+    assert compare._match_matrix.shape == (0, 0)
+    assert compare.column_stats == eager.column_stats
+    assert compare._phases == {"join", "compare"}
+    assert compare.count_matching_rows() == 2
+    assert compare.intersect_rows.equals(eager.intersect_rows)
+
+    compare = datacompy.Compare(df1, df2, "a", lazy=True, stats_only=True)
+    assert compare.all_rows_overlap() is False
+    assert compare.df1 is df1
+    assert compare.report() == compare.report()
+    assert compare.df1 is None
+    assert compare.column_stats == eager.column_stats
+
+
+def test_lazy_reassigned():
+    df1 = pd.DataFrame({"a": [1, 2, 3, 4], "b": [1.0, 2.0, 3.0, 4.0]})
+    df2 = pd.DataFrame({"a": [2, 3, 4, 5], "b": [2.0, 3.5, 4.0, 5.0]})
+    compare = datacompy.Compare(df1, df2, "a", lazy=True)
+    assert not compare.all_rows_overlap()
+    assert compare._phases == {"join"}
+    compare.df1 = pd.DataFrame({"a": [3, 4, 5, 6, 7], "b": [3.0, 4.0, 5.0, 6.0, 7.0]})
+    assert compare._phases == set()
+    assert list(compare.df1_unq_rows["a"]) == [6, 7]
+    assert compare._phases == {"join"}
+    assert compare.matches() is False
+    assert compare.count_matching_rows() == 2
+    assert compare._phases == {"join", "compare"}
+
+
+def test_key_overlap():
+    df1 = pd.DataFrame({"A": [1, 2, 2, 3, np.nan], "b": ["x", "y", "y", "z", "w"], "v": 1})
+    df2 = pd.DataFrame({"a": [2, 3, 4, np.nan], "B": ["y", "q", "z", "w"], "v": 2})
+    overlap = datacompy.key_overlap(df1, df2, ["a", "b"])
+    assert list(overlap["df1_unq_keys"]) == [(1.0, "x"), (3.0, "z")]
+    assert list(overlap["df2_unq_keys"]) == [(3.0, "q"), (4.0, "z")]
+    assert overlap["intersect_keys"][0] == (2.0, "y")
+    assert np.isnan(overlap["intersect_keys"][1][0])
+    assert (overlap["df1_unq_cnt"], overlap["df2_unq_cnt"], overlap["intersect_cnt"]) == (2, 2, 2)
+
+    overlap = datacompy.key_overlap(df1.set_index("A"), df2.set_index("a"), on_index=True)
+    assert list(overlap["df1_unq_keys"]) == [1.0]
+    assert list(overlap["df2_unq_keys"]) == [4.0]
+    assert overlap["intersect_cnt"] == 3
+
+    with raises(ValueError, match="df2 must have all columns from join_columns"):
+        datacompy.key_overlap(df1, df2.drop(columns="B"), ["a", "b"])
+
+    compare = datacompy.Compare(df1, df2, "a", lazy=True)
+    overlap = compare.key_overlap()
+    assert compare._phases == set()
+    assert list(overlap["df1_unq_keys"]) == [1.0]
+    assert list(overlap["df2_unq_keys"]) == [4.0]
+    assert overlap["intersect_cnt"] == 3
+
+
+def test_key_overlap_stats_only():
+    df1 = pd.DataFrame({"a": [1, 2, 3], "v": 1})
+    df2 = pd.DataFrame({"a": [2, 3, 4], "v": 1})
+    compare = datacompy.Compare(df1, df2, "a", stats_only=True, lazy=True)
+    assert compare.key_overlap()["intersect_cnt"] == 2
+    assert "key_overlap" in compare._derived
+    compare.report()
+    assert "key_overlap" not in compare._derived
+    with raises(ValueError, match="stats_only=True"):
+        compare.key_overlap()
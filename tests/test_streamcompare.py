@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2017 Capital One Services, LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Testing out the streaming datacompy functionality
+"""
+
+import logging
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+import six
+from pytest import raises
+
+import datacompy
+
+logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+
+
+def chunked(dataframe, chunksize):
+    return [dataframe.iloc[i : i + chunksize].copy() for i in range(0, len(dataframe), chunksize)]
+
+
+@pytest.mark.parametrize("chunksize1,chunksize2", [(1, 1), (2, 3), (4, 100)])
+def test_stream_matches_compare(chunksize1, chunksize2):
+    df1 = pd.DataFrame(
+        [
+            {"a": 1, "b": 1.0, "c": "hi"},
+            {"a": 2, "b": 2.0, "c": "yo"},
+            {"a": 2, "b": 2.5, "c": "yo"},
+            {"a": 4, "b": np.nan, "c": "hey"},
+            {"a": 5, "b": 5.0, "c": "sup"},
+            {"a": 7, "b": 7.0, "c": "hello"},
+        ]
+    )
+    df2 = pd.DataFrame(
+        [
+            {"a": 2, "b": 2.0, "c": "yo"},
+            {"a": 2, "b": 2.5, "c": "yo "},
+            {"a": 3, "b": 3.0, "c": "hi"},
+            {"a": 4, "b": 4.0, "c": "hey"},
+            {"a": 5, "b": 5.1, "c": "sup"},
+        ]
+    )
+    compare = datacompy.Compare(df1.copy(), df2.copy(), "a")
+    unq_rows = []
+    stream = datacompy.StreamCompare(
+        chunked(df1, chunksize1), chunked(df2, chunksize2), "a", df1_unq_handler=unq_rows.append
+    )
+    assert not stream.matches()
+    assert stream.df1_row_count == 6
+    assert stream.df2_row_count == 5
+    assert stream.intersect_row_count == len(compare.intersect_rows) == 4
+    assert stream.df1_unq_row_count == 2
+    assert stream.df2_unq_row_count == 1
+    assert sorted(pd.concat(unq_rows)["a"]) == [1, 7]
+    assert list(stream.df2_unq_rows_sample["a"]) == [3]
+    assert stream.count_matching_rows() == compare.count_matching_rows()
+
+    expected = dict((stats["column"], stats) for stats in compare.column_stats)
+    for stats in stream.column_stats:
+        for key in ("match_cnt", "unequal_cnt", "null_diff", "all_match"):
+            assert stats[key] == expected[stats["column"]][key]
+        assert np.isclose(stats["max_diff"], expected[stats["column"]]["max_diff"])
+    assert "Sample Rows Only in df1" in stream.report()
+
+
+def test_stream_read_csv():
+    data1 = "a,b\n1,1\n2,2\n3,3\n4,4\n5,5\n"
+    data2 = "a,b\n1,1\n2,2\n3,3\n4,4\n5,5\n"
+    stream = datacompy.StreamCompare(
+        pd.read_csv(six.StringIO(data1), chunksize=2),
+        pd.read_csv(six.StringIO(data2), chunksize=3),
+        ["a"],
+    )
+    assert stream.matches()
+    assert stream.intersect_row_count == 5
+
+
+def test_stream_sample_count():
+    df1 = pd.DataFrame({"a": range(100), "b": 1})
+    df2 = pd.DataFrame({"a": range(100), "b": 2})
+    stream = datacompy.StreamCompare(chunked(df1, 7), chunked(df2, 9), "a", sample_count=5)
+    stats = [stats for stats in stream.column_stats if stats["column"] == "b"][0]
+    assert stats["unequal_cnt"] == 100
+    assert len(stream.sample_mismatch("b")) == 5
+
+
+def test_stream_unsorted():
+    df1 = pd.DataFrame({"a": [1, 3, 2, 4], "b": 1})
+    df2 = pd.DataFrame({"a": [1, 2, 3, 4], "b": 1})
+    with raises(ValueError):
+        datacompy.StreamCompare(chunked(df1, 4), chunked(df2, 1), "a")
+
+
+def test_stream_null_keys():
+    df1 = pd.DataFrame({"a": [1, np.nan], "b": 1})
+    df2 = pd.DataFrame({"a": [1, 2], "b": 1})
+    with raises(ValueError):
+        datacompy.StreamCompare(chunked(df1, 1), chunked(df2, 1), "a")